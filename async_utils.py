@@ -1,68 +1,275 @@
 """
 Async utilities for handling cross-thread async operations
+
+Importing this module installs uvloop (winloop on Windows) as the event loop
+policy when it is available, so loops created afterwards with asyncio.run()
+use the faster implementation. Falls back to the default asyncio loop.
 """
 
+from __future__ import annotations
+
 import asyncio
+import collections
+import concurrent.futures
 import logging
-from typing import Any, Coroutine, Optional
+import os
+import threading
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    from typing import Coroutine, Deque, Iterable
 
 logger = logging.getLogger(__name__)
 
 
-def schedule_async_task(coro: Coroutine, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+def _install_fast_event_loop() -> Optional[str]:
+    """Install uvloop/winloop as the event loop policy if available"""
+    try:
+        if os.name == 'nt':
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        return None
+    asyncio.set_event_loop_policy(fast_loop.EventLoopPolicy())
+    return fast_loop.__name__
+
+
+EVENT_LOOP_IMPL = _install_fast_event_loop() or 'asyncio'
+
+# C-accelerated accessor behind asyncio.get_running_loop(); returns None
+# instead of raising when called outside a running loop
+_get_running_loop = asyncio.events._get_running_loop
+
+# Event loop owned by the orchestrator, set once at startup by register_loop()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Coroutines submitted to the registered loop from other threads. They are
+# drained by a single loop callback, so a burst of submissions costs one
+# wakeup instead of one per coroutine.
+_pending: Deque[Coroutine] = collections.deque()
+_pending_lock = threading.Lock()
+_drain_scheduled = False
+
+# Pre-bound callables used on every schedule, saving the attribute lookups
+_pending_append = _pending.append
+_pending_popleft = _pending.popleft
+_run_coroutine_threadsafe = asyncio.run_coroutine_threadsafe
+
+
+def register_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Register the orchestrator's event loop as the default scheduling target"""
+    global _loop
+    _loop = loop
+
+
+def schedule_async_task(coro: Coroutine, loop: Optional[asyncio.AbstractEventLoop] = None,
+                        observe_result: bool = False) -> Optional[Union[asyncio.Task, concurrent.futures.Future]]:
     """
     Schedule an async coroutine as a task from any thread.
-    
+
     Args:
         coro: The coroutine to schedule
-        loop: The event loop to use (if None, tries to get the running loop)
+        loop: The event loop to use (if None, uses the loop passed to register_loop)
+        observe_result: The caller will consume the result itself. The task
+            (or concurrent future when called off the loop thread) is returned
+            and no exception-logging callback is attached.
+
+    Returns:
+        The task/future when observe_result is True, otherwise None
+
+    Raises:
+        RuntimeError: If no loop is given and none has been registered
     """
+    running = _get_running_loop()
+    if running is not None and (loop is None or running is loop):
+        # Already inside the target loop, create task directly
+        task = running.create_task(coro)
+        return task if observe_result else None
+
+    if loop is None:
+        loop = _registered_loop()
+
+    if observe_result:
+        # The caller gets the future (and its exception) back directly
+        return _run_coroutine_threadsafe(coro, loop)
+
+    _schedule_threadsafe(coro, loop)
+
+
+def _registered_loop() -> asyncio.AbstractEventLoop:
+    """Return the loop passed to register_loop"""
+    if _loop is None:
+        raise RuntimeError("No event loop registered, call register_loop() first")
+    return _loop
+
+
+def _schedule_threadsafe(coro: Coroutine, loop: asyncio.AbstractEventLoop) -> None:
+    """Schedule a coroutine onto a loop that is not running in this thread"""
     try:
-        if loop is None:
-            # Try to get the running loop
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                # No running loop, try to get the event loop
-                loop = asyncio.get_event_loop()
-        
-        # Check if we're in the same thread as the loop
-        try:
-            # If we can get the running loop, we're in the async context
-            current_loop = asyncio.get_running_loop()
-            if current_loop == loop:
-                # We're in the loop's thread, create task directly
-                loop.create_task(coro)
-            else:
-                # Different loop, use thread-safe scheduling
-                asyncio.run_coroutine_threadsafe(coro, loop)
-        except RuntimeError:
-            # We're not in an async context, use thread-safe scheduling
-            def create_task():
-                task = loop.create_task(coro)
-                task.add_done_callback(_handle_task_exception)
-            
-            loop.call_soon_threadsafe(create_task)
-            
-    except Exception as e:
-        logger.error(f"Error scheduling async task: {e}", exc_info=True)
+        if loop is _loop:
+            # Not in the loop's thread, queue for the next drain
+            _pending_append(coro)
+            _wake_drain(loop)
+        else:
+            # Different loop, use thread-safe scheduling
+            future = _run_coroutine_threadsafe(coro, loop)
+            future.add_done_callback(_handle_future_exception)
+    except RuntimeError as e:
+        # Target loop is closed, drop what can no longer run
+        logger.error(f"Error scheduling async task: {e}")
+        if loop is _loop:
+            while _pending:
+                _pending.popleft().close()
+        else:
+            coro.close()
+
+
+def schedule_async_task_many(coros: Iterable[Coroutine],
+                             loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    """
+    Schedule several coroutines at once from any thread.
+
+    Off the loop thread the whole batch costs a single cross-thread wakeup
+    instead of one per coroutine.
+
+    Args:
+        coros: The coroutines to schedule
+        loop: The event loop to use (if None, uses the loop passed to register_loop)
+
+    Raises:
+        RuntimeError: If no loop is given and none has been registered
+    """
+    running = _get_running_loop()
+    if running is not None and (loop is None or running is loop):
+        # Already inside the target loop, no trampoline needed
+        _bulk_create_tasks(running, coros)
+        return
+
+    if loop is None:
+        loop = _registered_loop()
+
+    coros = tuple(coros)
+    try:
+        if loop is _loop:
+            _pending.extend(coros)
+            _wake_drain(loop)
+        else:
+            loop.call_soon_threadsafe(_bulk_create_tasks, loop, coros)
+    except RuntimeError as e:
+        # Target loop is closed, drop what can no longer run
+        logger.error(f"Error scheduling async tasks: {e}")
+        if loop is _loop:
+            while _pending:
+                _pending_popleft().close()
+        else:
+            for coro in coros:
+                coro.close()
+
+
+def _bulk_create_tasks(loop: asyncio.AbstractEventLoop, coros: Iterable[Coroutine]) -> None:
+    """Create a task for each coroutine (runs on the target loop)"""
+    create_task = loop.create_task
+    for coro in coros:
+        task = create_task(coro)
+        task.add_done_callback(_handle_task_exception)
+
+
+def schedule_from_loop_thread(coro: Coroutine) -> asyncio.Task:
+    """
+    Schedule a coroutine on the registered loop from the loop's own thread.
+
+    Skips the thread detection of schedule_async_task for call sites that
+    always run inside the loop (e.g. coroutines spawning follow-up work).
+
+    Raises:
+        RuntimeError: If no loop has been registered
+    """
+    task = _registered_loop().create_task(coro)
+    task.add_done_callback(_handle_task_exception)
+    return task
+
+
+def schedule_from_external_thread(coro: Coroutine) -> None:
+    """
+    Schedule a coroutine on the registered loop from any other thread.
+
+    Skips the thread detection of schedule_async_task for call sites that
+    never run inside the loop (e.g. paho MQTT callbacks).
+
+    Raises:
+        RuntimeError: If no loop has been registered, before the coroutine is queued
+    """
+    loop = _registered_loop()
+    _pending_append(coro)
+    _wake_drain(loop)
+
+
+def _wake_drain(loop: asyncio.AbstractEventLoop) -> None:
+    """Post a drain callback to the loop unless one is already pending"""
+    global _drain_scheduled
+    with _pending_lock:
+        if _drain_scheduled:
+            return
+        _drain_scheduled = True
+    try:
+        loop.call_soon_threadsafe(_drain_pending)
+    except RuntimeError:
+        with _pending_lock:
+            _drain_scheduled = False
+        raise
+
+
+def _drain_pending() -> None:
+    """Create tasks for all queued coroutines (runs on the registered loop)"""
+    global _drain_scheduled
+    # Clear the flag before draining so submissions racing with the drain
+    # post a fresh callback instead of being left in the queue
+    with _pending_lock:
+        _drain_scheduled = False
+    create_task = _loop.create_task
+    while _pending:
+        task = create_task(_pending_popleft())
+        task.add_done_callback(_handle_task_exception)
 
 
 def _handle_task_exception(task: asyncio.Task) -> None:
     """Handle exceptions from scheduled tasks"""
-    try:
-        task.result()
-    except asyncio.CancelledError:
-        pass  # Task was cancelled, this is normal
-    except Exception as e:
-        logger.error(f"Exception in scheduled task: {e}", exc_info=True)
+    if task.cancelled():
+        return  # Task was cancelled, this is normal
+    # exception() returns the error without the raise/catch round trip of result()
+    exc = task.exception()
+    if exc is not None and logger.isEnabledFor(logging.ERROR):
+        logger.error("Exception in scheduled task: %s", exc, exc_info=exc)
+
 
+def _handle_future_exception(future: concurrent.futures.Future) -> None:
+    """Handle exceptions from coroutines scheduled from another thread"""
+    if future.cancelled():
+        return  # Task was cancelled, this is normal
+    exc = future.exception()
+    if exc is not None and logger.isEnabledFor(logging.ERROR):
+        logger.error("Exception in scheduled task: %s", exc, exc_info=exc)
 
-async def run_in_task(coro: Coroutine) -> Any:
+
+def run_in_task(coro: Coroutine) -> Coroutine:
     """
     Ensure a coroutine runs in a proper task context.
-    
-    This is useful when you need to ensure aiohttp operations
-    run within a task context.
+
+    Deprecated: awaiting a coroutine already runs it in the caller's task,
+    which is all aiohttp needs on Python 3.11+, so this returns the coroutine
+    unchanged. ``await run_in_task(coro)`` keeps working; new code should
+    just ``await coro`` (or use fire_and_forget for a detached task).
+    """
+    return coro
+
+
+def fire_and_forget(coro: Coroutine) -> asyncio.Future:
+    """
+    Run a coroutine as a detached task on the running loop.
+
+    Exceptions are logged instead of being left unretrieved.
     """
-    return await asyncio.create_task(coro)
\ No newline at end of file
+    task = asyncio.ensure_future(coro)
+    task.add_done_callback(_handle_task_exception)
+    return task
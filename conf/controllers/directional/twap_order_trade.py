@@ -1,8 +1,11 @@
 import asyncio
+import logging
 import time
-from enum import Enum
+from collections import deque
+from dataclasses import asdict, dataclass
+from enum import IntEnum
 from decimal import Decimal
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from pydantic import Field
 
@@ -13,19 +16,92 @@ from hummingbot.strategy_v2.controllers.directional_trading_controller_base impo
     DirectionalTradingControllerConfigBase,
 )
 from hummingbot.core.data_type.common import OrderType, TradeType, PositionAction, PriceType
+from hummingbot.core.event.event_forwarder import SourceInfoEventForwarder
+from hummingbot.core.event.events import MarketEvent, OrderFilledEvent
 from hummingbot.strategy_v2.executors.order_executor.data_types import ExecutionStrategy, OrderExecutorConfig
 from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, ExecutorAction
 from hummingbot.strategy_v2.models.executors import CloseType
 
 
-class ControllerState(Enum):
+# Quote amounts used for batch sizing are kept as integers scaled by 10^8 and
+# only converted back to Decimal at the OrderExecutorConfig boundary
+_QUOTE_SCALE = 10 ** 8
+_DEC_QUOTE_SCALE = Decimal(_QUOTE_SCALE)
+
+# Shared Decimal constants for the per-tick paths
+_DEC_ZERO = Decimal("0")
+_DEC_ONE = Decimal("1")
+
+
+def _to_scaled(value: Decimal) -> int:
+    """Convert a Decimal quote amount to a scaled integer"""
+    return int(value * _QUOTE_SCALE)
+
+
+def _from_scaled(value: int) -> Decimal:
+    """Convert a scaled integer quote amount back to Decimal"""
+    return Decimal(value) / _DEC_QUOTE_SCALE
+
+
+def _batch_count(amount_scaled: int, batch_scaled: int) -> int:
+    """Number of batches needed for a scaled quote amount (ceiling division)"""
+    # Only valid on ints: Decimal // truncates toward zero, so -(-x // y) is not a ceiling there
+    return -(-amount_scaled // batch_scaled)
+
+
+def _filled_abs(filled_dict: Dict[str, Decimal], asset: str) -> Decimal:
+    """Absolute filled balance of an asset, zero if it has no fills yet"""
+    value = filled_dict.get(asset)
+    return abs(value) if value is not None else _DEC_ZERO
+
+
+EXECUTION_STRATEGY_MAP = {
+    "MARKET": ExecutionStrategy.MARKET,
+    "LIMIT": ExecutionStrategy.LIMIT,
+    "LIMIT_MAKER": ExecutionStrategy.LIMIT_MAKER,
+    "LIMIT_CHASER": ExecutionStrategy.LIMIT_CHASER,
+}
+
+
+class _ControllerLogAdapter(logging.LoggerAdapter):
+    """Prefix messages with the controller name, only for records that get emitted"""
+
+    def process(self, msg, kwargs):
+        return f"[{self.extra['ctl']}] {msg}", kwargs
+
+
+class ControllerState(IntEnum):
     """States for the TWAP Order Controller state machine"""
-    IDLE = "idle"
-    ENTERING = "entering"
-    HOLDING = "holding"
-    EXITING = "exiting"
-    COMPLETED = "completed"
-    ERROR = "error"
+    IDLE = 0
+    ENTERING = 1
+    HOLDING = 2
+    EXITING = 3
+    COMPLETED = 4
+    ERROR = 5
+
+    @property
+    def label(self) -> str:
+        """Lower-case state name used in status output"""
+        return self.name.lower()
+
+
+@dataclass(slots=True)
+class ControllerStatusView:
+    """Snapshot of the controller status, floats ready for serialization"""
+    controller_name: str
+    state: str
+    trading_pair: str
+    total_amount_quote: float
+    batch_size_quote: float
+    position_size: float
+    entry_avg_price: float
+    current_price: float
+    entry_batches_completed: int
+    entry_batches_total: int
+    exit_batches_completed: int
+    exit_batches_total: int
+    entry_amount_filled: float
+    exit_amount_filled: float
 
 
 class TWAPOrderControllerConfig(DirectionalTradingControllerConfigBase):
@@ -93,6 +169,9 @@ class TWAPOrderController(DirectionalTradingControllerBase):
         self.hold_start_time: Optional[float] = None
         self.exit_start_time: Optional[float] = None
         self.exit_completion_time: Optional[float] = None
+        self._results_reported = False
+        # Resolved by the transition to COMPLETED, replaces polling the state
+        self._completed_future: asyncio.Future = asyncio.get_event_loop().create_future()
 
         # TWAP batch tracking
         self.entry_batches_completed = 0
@@ -100,38 +179,137 @@ class TWAPOrderController(DirectionalTradingControllerBase):
         self.exit_batches_completed = 0
         self.exit_batches_total = 0
         self.last_batch_time = 0
+        # Clock reading shared by everything that runs within one tick
+        self._tick_now = self.market_data_provider.time()
         
+        # Executors bucketed by phase/status, refreshed once per tick by _classify_executors()
+        self._entry_active_executors = []
+        self._entry_done_hold_executors = []
+        self._entry_done_failed_executors = []
+        self._exit_active_executors = []
+        self._exit_done_executors = []
+        self._active_entry_count = 0
+        self._active_exit_count = 0
+        self._active_executor_count = 0  # all active executors, including ones without a batch level id
+        self._exit_amount_filled: Optional[Decimal] = None  # per-tick memo of exit_amount_filled
+        self._missing_filled_base_logged = False
+        self._last_entry_progress: Optional[tuple] = None  # entry fills/executor counts seen last tick
+
         # Position tracking
-        self.entry_amount_filled = Decimal("0")
+        self.entry_amount_filled = _DEC_ZERO
         #self.exit_amount_filled = Decimal("0")
         
+        # The remaining base position is kept current from fill events. It and the
+        # filled quote are reconciled against the connector's filled balances every
+        # _reconcile_interval seconds, and on the tick after a fill
+        self.holding_amount = _DEC_ZERO
+        self.exit_base_amount_filled = _DEC_ZERO
+        self._reconcile_interval = 1.0
+        self._last_reconcile_ts: Optional[float] = None
+
         # Market data cache
-        self._last_price = Decimal("0")
+        self._last_price = _DEC_ZERO
+        # asset -> (market time, absolute filled amount) for the base and quote assets
+        self._filled_balance_cache: Dict[str, Tuple[float, Decimal]] = {}
+        self._balance_cache_ttl = 0.25
+        self._last_done_executor_count = 0
 
         # Trade sides
         self.entry_side = TradeType.BUY if config.entry_side.upper() == "BUY" else TradeType.SELL
         self.exit_side = TradeType.SELL if config.entry_side.upper() == "BUY" else TradeType.BUY
 
+        # Execution strategy (fixed for the lifetime of the controller)
+        self._execution_strategy = EXECUTION_STRATEGY_MAP.get(
+            config.execution_strategy.upper(), ExecutionStrategy.LIMIT_MAKER)
+        self._is_market = self._execution_strategy is ExecutionStrategy.MARKET
+        # Limit price multipliers around the mid price
+        self._buy_buffer_mul = _DEC_ONE + config.price_buffer_pct
+        self._sell_buffer_mul = _DEC_ONE - config.price_buffer_pct
+
+        # Market type and the leverage sent with every order
+        self._is_perpetual = "perpetual" in config.connector_name.lower()
+        self._effective_leverage = config.leverage if self._is_perpetual else 1
+
         # Control flags
         self._should_start_entry = True
         self._should_start_exit = False
 
         # Get connector and parse trading pair
         self.connector = self.market_data_provider.get_connector(self.config.connector_name)
-        self.base = self.config.trading_pair.split("-")[0]
-        self.quote = self.config.trading_pair.split("-")[1]
+        pair_parts = self.config.trading_pair.split("-")
+        self.base, self.quote = pair_parts[0], pair_parts[1]
+        self._normalized_pair = self.config.trading_pair.replace("-", "_").lower()
+
+        # Scaled integer copies of the quote sizing parameters
+        self._total_quote_scaled = _to_scaled(self.config.total_amount_quote)
+        self._batch_quote_scaled = _to_scaled(self.config.batch_size_quote)
+        self._min_notional_scaled = _to_scaled(self.config.min_notional_size)
+        # Filled quote at which the entry phase counts as complete
+        self._entry_complete_threshold = self.config.total_amount_quote - self.config.min_notional_size
 
         # Calculate total batches needed for entry
-        self.entry_batches_total = int(self.config.total_amount_quote / self.config.batch_size_quote)
-        if self.config.total_amount_quote % self.config.batch_size_quote > 0:
-            self.entry_batches_total += 1
+        self.entry_batches_total = _batch_count(self._total_quote_scaled, self._batch_quote_scaled)
+
+        # Batch level ids, built ahead of time and extended lazily if more batches are needed
+        self._entry_level_ids: List[str] = []
+        self._exit_level_ids: List[str] = []
+        self._entry_level_set = set()
+        self._exit_level_set = set()
+        if self.entry_batches_total > 0:
+            self._batch_level_id(self._entry_level_ids, self._entry_level_set,
+                                 "entry_batch_", self.entry_batches_total - 1)
+
+        # Logger carrying the controller name, so call sites don't format a prefix
+        self._log = _ControllerLogAdapter(self.logger(), {'ctl': self.config.controller_name})
 
-        self.logger().info(f"TWAP Order Controller initialized for {self.config.trading_pair}")
-        self.logger().info(f"Total entry batches planned: {self.entry_batches_total}")
+        self.logger().info("TWAP Order Controller initialized for %s", self.config.trading_pair)
+        self.logger().info("Total entry batches planned: %s", self.entry_batches_total)
 
         # Initialize notification system
         self.notifications = None
 
+        # Config lines of the status view, formatted once
+        self._status_name_line = f"Controller: {self.config.controller_name}"
+        self._build_static_status_lines()
+
+        # Status views are rebuilt only when _status_rev moved since they were cached
+        self._status_rev = 0
+        self._status_view: Optional[ControllerStatusView] = None
+        self._status_cache_rev = -1
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_cache_view: Optional[ControllerStatusView] = None  # view _status_cache was built from
+        self._format_status_cache: Optional[List[str]] = None
+        self._format_status_cache_rev = -1
+        # Repeated polls within this many seconds get the cached view even if state moved
+        self._status_debounce = 0.1
+        self._status_cache_ts = float("-inf")
+        self._format_status_cache_ts = float("-inf")
+
+        # State -> per-tick handler (IDLE is handled separately in update_processed_data)
+        self._state_handlers = {
+            ControllerState.ENTERING: self._monitor_entry_progress,
+            ControllerState.HOLDING: self._check_exit_conditions,
+            ControllerState.EXITING: self._monitor_exit_progress,
+            ControllerState.COMPLETED: self._report_final_results,
+        }
+
+        # State -> status progress renderer
+        self._status_renderers = {
+            ControllerState.ENTERING: self._render_entering,
+            ControllerState.HOLDING: self._render_holding,
+            ControllerState.EXITING: self._render_exiting,
+        }
+
+        # Control signal action -> handler
+        self._signal_handlers = {
+            "start_entry": self._on_start_entry_signal,
+            "start_exit": self._on_start_exit_signal,
+            "new_total_quote": self._on_new_total_quote_signal,
+        }
+        # Signals received since the last tick, drained in one batch at the start
+        # of the next tick (deque append/popleft are thread-safe, no lock needed)
+        self._signal_queue = deque()
+
         # if the connector is in test mode start_entry here
         if self.config.test_mode:
             self.start_entry()
@@ -141,14 +319,15 @@ class TWAPOrderController(DirectionalTradingControllerBase):
             self.start_entry()
             self.logger().info("Auto-starting entry phase based on configuration")
 
+        self._init_fill_listener()
+
         if self._start_listener:
             self._init_signal_listener()
 
     def _init_signal_listener(self):
         """Initialize a listener for ML signals from the MQTT broker"""
         try:
-            normalized_pair = self.config.trading_pair.replace("-", "_").lower()
-            topic = f"{self.config.notifications_topic}/{normalized_pair}/control_signals"
+            topic = f"{self.config.notifications_topic}/{self._normalized_pair}/control_signals"
             self._signal_listener = ExternalTopicFactory.create_async(
                 topic=topic,
                 callback=self._handle_signal,
@@ -156,39 +335,128 @@ class TWAPOrderController(DirectionalTradingControllerBase):
             )
             self.logger().info("ML signal listener initialized successfully")
         except Exception as e:
-            self.logger().error(f"Failed to initialize ML signal listener: {str(e)}")
+            self.logger().error("Failed to initialize ML signal listener: %s", e)
             self._signal_listener = None
 
+    def _init_fill_listener(self):
+        """Subscribe to the connector's fill events to track the holding amount"""
+        try:
+            # Connectors keep weak references to listeners, hold on to the forwarder
+            self._fill_forwarder = SourceInfoEventForwarder(self._on_order_filled)
+            self.connector.add_listener(MarketEvent.OrderFilled, self._fill_forwarder)
+        except Exception as e:
+            self.logger().error("Failed to initialize fill listener: %s", e)
+            self._fill_forwarder = None
+
+    def _on_order_filled(self, event_tag: int, market: Any, event: OrderFilledEvent):
+        """Apply a fill on this controller's trading pair to the holding amount"""
+        if event.trading_pair != self.config.trading_pair:
+            return
+        if event.trade_type == self.entry_side:
+            self.holding_amount += event.amount
+        else:
+            self.holding_amount -= event.amount
+        # The cached balances predate this fill. The filled quote includes fees, so it is
+        # left to the reconcile, which now runs on the next tick.
+        self._filled_balance_cache.clear()
+        self._last_reconcile_ts = None
+        if self.state == ControllerState.ENTERING:
+            self._position_size = None
+        elif self.state == ControllerState.EXITING:
+            self.exit_base_amount_filled = self.position_size - self.holding_amount
+        self._status_rev += 1
+
     def _handle_signal(self, signal: dict, topic: str):
-        """Handle incoming ML signal to control entry/exit phases"""
+        """
+        Queue an incoming ML signal to control entry/exit phases.
+
+        The queue is drained once per tick and only the latest signal per
+        action is applied, so a burst of messages results in a single state
+        transition.
+        """
         # self.logger().info(f"Received ML signal: {signal}")
-        if signal.get("action") == "start_entry":
-            self.start_entry()
-        elif signal.get("action") == "start_exit":
-            self.logger().info("signal received, exiting phase starting")
-            self._start_exit_phase() # start_exit()
-        elif signal.get("action") == "new_total_quote":
-            # TODO: This is not completed yet, we need to handle the new total quote and check the logic so the bot can continue trading
-            new_total_quote = Decimal(signal.get("total_quote", "0"))
-            if new_total_quote > self.config.total_amount_quote:
-                self.config.total_amount_quote = new_total_quote
-                self.entry_batches_total = int(new_total_quote / self.config.batch_size_quote)
-                if new_total_quote % self.config.batch_size_quote > 0:
-                    self.entry_batches_total += 1
-                self.logger().info(f"Updated total amount quote to {new_total_quote}, "
-                                  f"recalculated entry batches: {self.entry_batches_total}")
-
-                if self.state == ControllerState.HOLDING:
-                    # we need to change state to continue trading
-                    self.state = ControllerState.ENTERING
-        else:
-            self.logger().warning(f"Unknown ML signal action: {signal.get('action')}")
+        self._signal_queue.append(signal)
 
+    def _apply_pending_signals(self):
+        """Dispatch the signals buffered since the previous tick, latest per action in arrival order"""
+        queue = self._signal_queue
+        if not queue:
+            return
+        latest: Dict[str, dict] = {}
+        popleft = queue.popleft
+        while queue:
+            signal = popleft()
+            try:
+                action = signal.get("action")
+            except AttributeError:
+                self.logger().warning("Ignoring malformed ML signal: %s", signal)
+                continue
+            # Re-insert so the actions are applied in the order of their latest signal
+            latest.pop(action, None)
+            latest[action] = signal
+        handlers = self._signal_handlers
+        for action, signal in latest.items():
+            handler = handlers.get(action)
+            if handler is None:
+                self.logger().warning("Unknown ML signal action: %s", action)
+                continue
+            # A bad signal must not put the controller in ERROR or drop the others of this tick
+            try:
+                handler(signal)
+            except Exception as e:
+                self.logger().error("Error handling ML signal %s: %s", signal, e)
+
+    def _on_start_entry_signal(self, signal: dict):
+        """Handle the start_entry control signal"""
+        self.start_entry()
+
+    def _on_start_exit_signal(self, signal: dict):
+        """Handle the start_exit control signal"""
+        self.logger().info("signal received, exiting phase starting")
+        self._start_exit_phase() # start_exit()
+
+    def _on_new_total_quote_signal(self, signal: dict):
+        """Handle the new_total_quote control signal"""
+        # TODO: This is not completed yet, we need to handle the new total quote and check the logic so the bot can continue trading
+        new_total_quote = Decimal(signal.get("total_quote", "0"))
+        if new_total_quote > self.config.total_amount_quote:
+            self.config.total_amount_quote = new_total_quote
+            self._total_quote_scaled = _to_scaled(new_total_quote)
+            self._entry_complete_threshold = new_total_quote - self.config.min_notional_size
+            self._last_entry_progress = None
+            self._build_static_status_lines()
+            self.entry_batches_total = _batch_count(self._total_quote_scaled, self._batch_quote_scaled)
+            self.logger().info("Updated total amount quote to %s, recalculated entry batches: %s",
+                               new_total_quote, self.entry_batches_total)
+
+            if self.state == ControllerState.HOLDING:
+                # we need to change state to continue trading
+                self.state = ControllerState.ENTERING
+                self._position_size = None
+
+
+    def _get_filled(self, asset: str) -> Decimal:
+        """
+        Absolute filled amount of the base or quote asset.
+
+        The connector builds a fresh balances dict on every call, so both
+        assets are cached from a single fetch for _balance_cache_ttl seconds
+        or until an executor finishes.
+        """
+        now = self.market_data_provider.time()
+        cached = self._filled_balance_cache.get(asset)
+        if cached is not None and now - cached[0] < self._balance_cache_ttl:
+            return cached[1]
+        filled_dict = self.connector.order_filled_balances()
+        cache = self._filled_balance_cache
+        cache[self.base] = (now, _filled_abs(filled_dict, self.base))
+        cache[self.quote] = (now, _filled_abs(filled_dict, self.quote))
+        return cache[asset][1]
 
     @property
     def is_perpetual(self) -> bool:
         """Check if trading perpetual contracts"""
-        return "perpetual" in self.config.connector_name.lower()
+        return self._is_perpetual
 
     @property
     def position_size(self) -> Decimal:
@@ -196,14 +464,16 @@ class TWAPOrderController(DirectionalTradingControllerBase):
         try:
             return self.get_position_size()
         except Exception as e:
-            self.logger().error(f"Error getting position size: {e}")
-            return Decimal("0")
+            self.logger().error("Error getting position size: %s", e)
+            return _DEC_ZERO
 
     def get_position_size(self):
         try:
+            if self.state is ControllerState.HOLDING and self._position_size is not None:
+                # No fills happen while holding, the last known size is still valid
+                return self._position_size
             if self.state == ControllerState.ENTERING or self.state == ControllerState.HOLDING:
-                filled_dict = self.connector.order_filled_balances()
-                self._position_size = abs(filled_dict.get(self.base, Decimal("0")))
+                self._position_size = self._get_filled(self.base)
                 position_size = self._position_size
             elif self.state == ControllerState.IDLE:
                 # In IDLE state, we assume no position is held
@@ -212,75 +482,140 @@ class TWAPOrderController(DirectionalTradingControllerBase):
                 position_size = self._position_size
             return position_size
         except Exception as e:
-            self.logger().error(f"Error getting position size: {e}")
-            return Decimal("0")
+            self.logger().error("Error getting position size: %s", e)
+            return _DEC_ZERO
 
     @property
     def entry_avg_price(self) -> Decimal:
         """Calculate average entry price from filled orders"""
         try:
-            filled_dict = self.connector.order_filled_balances()
-            filled_quote = abs(filled_dict.get(self.quote, Decimal("0")))
-            filled_base = abs(filled_dict.get(self.base, Decimal("0")))
+            filled_quote = self._get_filled(self.quote)
+            filled_base = self._get_filled(self.base)
             
             if filled_base > 0:
                 return filled_quote / filled_base
-            return Decimal("0")
+            return _DEC_ZERO
         except Exception as e:
-            self.logger().error(f"Error calculating entry avg price: {e}")
-            return Decimal("0")
+            self.logger().error("Error calculating entry avg price: %s", e)
+            return _DEC_ZERO
 
     @property
     def exit_amount_filled(self) -> Decimal:
         """Get total amount filled for exit orders"""
+        if self._exit_amount_filled is not None:
+            return self._exit_amount_filled
         try:
-            completed_exit_executors = self.filter_executors(
-                executors=self.executors_info,
-                filter_func=lambda x: (x.is_done and
-                                       hasattr(x, 'custom_info') and
-                                       x.custom_info.get('level_id', '').startswith('exit_batch_'))
-            )
-            total_exit_amount = Decimal("0")
-            for executor in completed_exit_executors:
-                if hasattr(executor, 'filled_amount_base'):
-                    total_exit_amount += executor.filled_amount_base
+            try:
+                total_exit_amount = sum((e.filled_amount_base for e in self._exit_done_executors), _DEC_ZERO)
+            except AttributeError:
+                if not self._missing_filled_base_logged:
+                    self.logger().warning("Exit executor info without filled_amount_base, skipping those executors")
+                    self._missing_filled_base_logged = True
+                total_exit_amount = sum((e.filled_amount_base for e in self._exit_done_executors
+                                         if hasattr(e, 'filled_amount_base')), _DEC_ZERO)
+            self._exit_amount_filled = total_exit_amount
             return total_exit_amount
         except Exception as e:
-            self.logger().error(f"Error getting exit amount filled: {e}")
-            return Decimal("0")
+            self.logger().error("Error getting exit amount filled: %s", e)
+            return _DEC_ZERO
 
     async def update_processed_data(self):
         """
         Main controller logic called periodically by the framework.
         Implements the state machine for TWAP trading.
         """
+        self._tick_now = self.market_data_provider.time()
         try:
+            # Apply control signals received since the previous tick
+            self._apply_pending_signals()
+
             # Update current market price
             self._update_current_price()
 
-            # State machine logic
-            if self.state == ControllerState.IDLE and self._should_start_entry:
-                self._start_entry_phase()
-                
-            elif self.state == ControllerState.ENTERING:
-                self._monitor_entry_progress()
-                
-            elif self.state == ControllerState.HOLDING:
-                self._check_exit_conditions()
-                
-            elif self.state == ControllerState.EXITING:
-                self._monitor_exit_progress()
-                
-            elif self.state == ControllerState.COMPLETED:
-                self._report_final_results()
-                # close hummingbot gracefully
-
+            # Bucket executors once for this tick
+            self._classify_executors()
 
+            # State machine logic
+            if self.state == ControllerState.IDLE:
+                if self._should_start_entry:
+                    self._start_entry_phase()
+            else:
+                handler = self._state_handlers.get(self.state)
+                if handler is not None:
+                    handler()
 
         except Exception as e:
-            self.logger().error(f"Error in update_processed_data: {e}")
+            self.logger().error("Error in update_processed_data: %s", e)
             self._handle_error(str(e))
 
+        # Price, fills and executors may all have moved, invalidate the status caches
+        self._status_rev += 1
+
+    def _classify_executors(self):
+        """Scan executors_info once and bucket entry/exit executors by status"""
+        entry_active = []
+        entry_done_hold = []
+        entry_done_failed = []
+        exit_active = []
+        exit_done = []
+        entry_level_set = self._entry_level_set
+        exit_level_set = self._exit_level_set
+
+        active_count = 0
+
+        for executor in self.executors_info:
+            is_active = executor.is_active
+            if is_active:
+                active_count += 1
+            custom_info = getattr(executor, 'custom_info', None)
+            if not custom_info:
+                continue
+            level_id = custom_info.get('level_id') or ''
+            if level_id in entry_level_set:
+                is_entry = True
+            elif level_id in exit_level_set:
+                is_entry = False
+            elif level_id.startswith('entry_batch_'):
+                # Not created by this instance (e.g. restored), remember it
+                entry_level_set.add(level_id)
+                is_entry = True
+            elif level_id.startswith('exit_batch_'):
+                exit_level_set.add(level_id)
+                is_entry = False
+            else:
+                continue
+
+            if is_entry:
+                if is_active:
+                    entry_active.append(executor)
+                elif executor.is_done:
+                    if executor.close_type == CloseType.POSITION_HOLD:
+                        entry_done_hold.append(executor)
+                    else:
+                        entry_done_failed.append(executor)
+            else:
+                if is_active:
+                    exit_active.append(executor)
+                elif executor.is_done:
+                    exit_done.append(executor)
+
+        self._entry_active_executors = entry_active
+        self._entry_done_hold_executors = entry_done_hold
+        self._entry_done_failed_executors = entry_done_failed
+        self._exit_active_executors = exit_active
+        self._exit_done_executors = exit_done
+        self._active_entry_count = len(entry_active)
+        self._active_exit_count = len(exit_active)
+        self._active_executor_count = active_count
+        self._exit_amount_filled = None
+
+        # A finished executor means new fills, don't serve cached balances
+        done_count = len(entry_done_hold) + len(entry_done_failed) + len(exit_done)
+        if done_count != self._last_done_executor_count:
+            self._last_done_executor_count = done_count
+            self._filled_balance_cache.clear()
+            self._last_reconcile_ts = None
+
     def _update_current_price(self, price_type: PriceType = PriceType.MidPrice):
         """Update current market price for calculations"""
         try:
@@ -292,61 +627,47 @@ class TWAPOrderController(DirectionalTradingControllerBase):
             if price and price > 0:
                 self._last_price = price
         except Exception as e:
-            self.logger().error(f"Error updating current price: {e}")
+            self.logger().error("Error updating current price: %s", e)
 
     def determine_executor_actions(self) -> List[ExecutorAction]:
         """
         Create executor actions based on current state and timing.
         This method is called by the framework to get new orders to place.
         """
-        actions = []
-        current_time = self.market_data_provider.time()
+        # update_processed_data runs first in the same tick
+        current_time = self._tick_now
 
+        # Most ticks fall inside the batch interval, nothing to do then
+        if (self.last_batch_time != 0 and
+                current_time - self.last_batch_time < self.config.batch_interval):
+            return []
+
+        actions = []
         try:
-            # Check if it's time for the next batch and we're in the right state
-            if (current_time - self.last_batch_time >= self.config.batch_interval or
-                    self.last_batch_time == 0):
-
-                if self.state == ControllerState.ENTERING:
-                    # Check if there are any active entry executors before creating new ones
-                    active_entry_executors = self.filter_executors(
-                        executors=self.executors_info,
-                        filter_func=lambda x: (x.is_active and
-                                               hasattr(x, 'custom_info') and
-                                               x.custom_info.get('level_id', '').startswith('entry_batch_'))
-                    )
-
-                    # Only create new batch if no active entry executors exist
-                    if len(active_entry_executors) == 0:
-                        action = self._create_entry_batch_action()
-                        if action:
-                            actions.append(action)
-                            self.last_batch_time = current_time
-                    else:
-                        self.logger().debug(
-                            f"Skipping new entry batch - {len(active_entry_executors)} active executor(s) still processing")
-
-                elif self.state == ControllerState.EXITING:
-                    # Check if there are any active exit executors before creating new ones
-                    active_exit_executors = self.filter_executors(
-                        executors=self.executors_info,
-                        filter_func=lambda x: (x.is_active and
-                                               hasattr(x, 'custom_info') and
-                                               x.custom_info.get('level_id', '').startswith('exit_batch_'))
-                    )
-
-                    # Only create new batch if no active exit executors exist
-                    if len(active_exit_executors) == 0:
-                        action = self._create_exit_batch_action()
-                        if action:
-                            actions.append(action)
-                            self.last_batch_time = current_time
-                    else:
-                        self.logger().debug(
-                            f"Skipping new exit batch - {len(active_exit_executors)} active executor(s) still processing")
+            if self.state == ControllerState.ENTERING:
+                # Only create new batch if no active entry executors exist
+                if self._active_entry_count == 0:
+                    action = self._create_entry_batch_action()
+                    if action:
+                        actions.append(action)
+                        self.last_batch_time = current_time
+                else:
+                    self.logger().debug("Skipping new entry batch - %s active executor(s) still processing",
+                                        self._active_entry_count)
+
+            elif self.state == ControllerState.EXITING:
+                # Only create new batch if no active exit executors exist
+                if self._active_exit_count == 0:
+                    action = self._create_exit_batch_action()
+                    if action:
+                        actions.append(action)
+                        self.last_batch_time = current_time
+                else:
+                    self.logger().debug("Skipping new exit batch - %s active executor(s) still processing",
+                                        self._active_exit_count)
 
         except Exception as e:
-            self.logger().error(f"Error creating executor actions: {e}")
+            self.logger().error("Error creating executor actions: %s", e)
 
         return actions
 
@@ -360,43 +681,45 @@ class TWAPOrderController(DirectionalTradingControllerBase):
         #if self.entry_batches_completed >= self.entry_batches_total:
         #    return None
             
-        # Calculate batch size (handle last batch which might be smaller)
-        remaining_quote = self.config.total_amount_quote - self.entry_amount_filled
+        # Calculate batch size (handle last batch which might be smaller), in scaled integers
+        remaining_quote = self._total_quote_scaled - _to_scaled(self.entry_amount_filled)
         # here we control that the remaining quote after this trade is greater than the minimum notional size
-        if remaining_quote <= self.config.min_notional_size:
+        if remaining_quote <= self._min_notional_scaled:
             self.logger().warning("Remaining quote is less than minimum notional size, cannot place more orders.")
             return None
-        batch_quote = min(self.config.batch_size_quote, remaining_quote)
+        batch_quote = min(self._batch_quote_scaled, remaining_quote)
         # then we need to check if the remaining quote after this trade is sufficient to place a batch order otherwise we increase the batch size
-        if (remaining_quote - batch_quote) < self.config.min_notional_size:
+        if (remaining_quote - batch_quote) < self._min_notional_scaled:
             batch_quote = remaining_quote
             self.entry_batches_total -= 1  # Adjust total batches since this is the last one
             self.entry_batches_total = max(self.entry_batches_total, 1)  # Ensure total is not less than 1
-            self.logger().info(f"Adjusting entry batches total to {self.entry_batches_total} due to last batch size")
+            self.logger().info("Adjusting entry batches total to %s due to last batch size", self.entry_batches_total)
 
         
-        if batch_quote <= Decimal("0"):
+        if batch_quote <= 0:
             return None
             
         # Convert quote amount to base amount
+        batch_quote = _from_scaled(batch_quote)
         batch_amount = batch_quote / self._last_price
         
         # Create order executor config
         order_config = OrderExecutorConfig(
-            timestamp=self.market_data_provider.time(),
+            timestamp=self._tick_now,
             connector_name=self.config.connector_name,
             trading_pair=self.config.trading_pair,
             side=self.entry_side,
             amount=batch_amount,
-            execution_strategy=self._get_execution_strategy(),
+            execution_strategy=self._execution_strategy,
             price=self._get_order_price(self.entry_side),
             position_action=PositionAction.OPEN,
-            leverage=self.config.leverage if self.is_perpetual else 1,
-            level_id=f"entry_batch_{self.entry_batches_completed + 1}"
+            leverage=self._effective_leverage,
+            level_id=self._batch_level_id(self._entry_level_ids, self._entry_level_set,
+                                          "entry_batch_", self.entry_batches_completed)
         )
         
-        self.logger().info(f"Creating entry batch {self.entry_batches_completed + 1}/{self.entry_batches_total} "
-                          f"for {batch_quote} quote ({batch_amount} base)")
+        self.logger().info("Creating entry batch %s/%s for %s quote (%s base)",
+                           self.entry_batches_completed + 1, self.entry_batches_total, batch_quote, batch_amount)
         
         return CreateExecutorAction(
             controller_id=self.config.id,
@@ -416,27 +739,27 @@ class TWAPOrderController(DirectionalTradingControllerBase):
         # Calculate remaining position to exit
         self._update_exit_fill_tracking()
         remaining_position =  self.position_size - self.exit_base_amount_filled
-        if remaining_position <= Decimal("0"):
+        if remaining_position <= _DEC_ZERO:
             return None
 
-        remaining_position_quote = remaining_position * self._last_price
+        remaining_position_quote = _to_scaled(remaining_position * self._last_price)
 
         # get the btch size based on the current price
-        if remaining_position_quote <= self.config.min_notional_size:
+        if remaining_position_quote <= self._min_notional_scaled:
             self.logger().warning("Remaining position is less than minimum notional size, cannot place more orders.")
             return None
-        # Calculate batch size (handle last batch which might be smaller)
-        batch_size_quote = min(self.config.batch_size_quote, remaining_position_quote)
+        # Calculate batch size (handle last batch which might be smaller), in scaled integers
+        batch_size_quote = min(self._batch_quote_scaled, remaining_position_quote)
         # here we control that the remaining position after this trade is greater than the minimum notional size
-        if (remaining_position_quote - batch_size_quote) < self.config.min_notional_size:
+        if (remaining_position_quote - batch_size_quote) < self._min_notional_scaled:
             batch_size_quote = remaining_position_quote
             self.exit_batches_total-= 1  # Adjust total batches since this is the last one
-            self.logger().info(f"Adjusting exit batches total to {self.exit_batches_total} due to last batch size")
+            self.logger().info("Adjusting exit batches total to %s due to last batch size", self.exit_batches_total)
 
-        if batch_size_quote <= Decimal("0"):
+        if batch_size_quote <= 0:
             return None
         # Convert quote amount to base amount
-        batch_size_base = batch_size_quote / self._last_price
+        batch_size_base = _from_scaled(batch_size_quote) / self._last_price
 
         ## Calculate batch size for exit
         #batch_size_base = min(
@@ -452,35 +775,35 @@ class TWAPOrderController(DirectionalTradingControllerBase):
         
         # Create order executor config
         order_config = OrderExecutorConfig(
-            timestamp=self.market_data_provider.time(),
+            timestamp=self._tick_now,
             connector_name=self.config.connector_name,
             trading_pair=self.config.trading_pair,
             side=self.exit_side,
             amount=batch_size_base,
-            execution_strategy=self._get_execution_strategy(),
+            execution_strategy=self._execution_strategy,
             price=self._get_order_price(self.exit_side),
             position_action=PositionAction.CLOSE,
-            leverage=self.config.leverage if self.is_perpetual else 1,
-            level_id=f"exit_batch_{self.exit_batches_completed + 1}"
+            leverage=self._effective_leverage,
+            level_id=self._batch_level_id(self._exit_level_ids, self._exit_level_set,
+                                          "exit_batch_", self.exit_batches_completed)
         )
         
-        self.logger().info(f"Creating exit batch {self.exit_batches_completed + 1}/{self.exit_batches_total} "
-                          f"for {batch_size_base} base")
+        self.logger().info("Creating exit batch %s/%s for %s base",
+                           self.exit_batches_completed + 1, self.exit_batches_total, batch_size_base)
         
         return CreateExecutorAction(
             controller_id=self.config.id,
             executor_config=order_config
         )
 
-    def _get_execution_strategy(self) -> ExecutionStrategy:
-        """Convert string execution strategy to enum"""
-        strategy_map = {
-            "MARKET": ExecutionStrategy.MARKET,
-            "LIMIT": ExecutionStrategy.LIMIT,
-            "LIMIT_MAKER": ExecutionStrategy.LIMIT_MAKER,
-            "LIMIT_CHASER": ExecutionStrategy.LIMIT_CHASER
-        }
-        return strategy_map.get(self.config.execution_strategy.upper(), ExecutionStrategy.LIMIT_MAKER)
+    @staticmethod
+    def _batch_level_id(level_ids: List[str], level_set: set, prefix: str, index: int) -> str:
+        """Level id of the batch at the given 0-based index, extending the precomputed ids as needed"""
+        while len(level_ids) <= index:
+            level_id = f"{prefix}{len(level_ids) + 1}"
+            level_ids.append(level_id)
+            level_set.add(level_id)
+        return level_ids[index]
 
     def _get_order_price(self, side: TradeType) -> Optional[Decimal]:
         """
@@ -492,56 +815,51 @@ class TWAPOrderController(DirectionalTradingControllerBase):
         Returns:
             Price for the order or None for market orders
         """
-        if self._get_execution_strategy() == ExecutionStrategy.MARKET:
+        if self._is_market:
             return self._last_price
             
         # For limit orders, apply a small buffer to improve fill probability
         if side == TradeType.BUY:
             # For buy orders, place slightly above market price
-            return self._last_price * (Decimal("1") + self.config.price_buffer_pct)
+            return self._last_price * self._buy_buffer_mul
         else:
             # For sell orders, place slightly below market price
-            return self._last_price * (Decimal("1") - self.config.price_buffer_pct)
+            return self._last_price * self._sell_buffer_mul
 
     def _start_entry_phase(self):
         """Initialize the entry phase of TWAP trading"""
         self.state = ControllerState.ENTERING
-        self.entry_start_time = time.time()
+        self.entry_start_time = self._tick_now
         self._should_start_entry = False
         self.last_batch_time = 0  # Reset to allow immediate first batch
         
-        self.logger().info(f"Starting TWAP entry for {self.config.total_amount_quote} quote "
-                          f"in {self.entry_batches_total} batches")
+        self.logger().info("Starting TWAP entry for %s quote in %s batches",
+                           self.config.total_amount_quote, self.entry_batches_total)
 
     def _monitor_entry_progress(self):
         """Monitor progress of entry batches and transition to holding when complete"""
+        # Update filled amount tracking
+        self._update_entry_fill_tracking()
+
+        # Nothing to re-evaluate if no fill or executor status changed since the last tick
+        progress = (self.entry_amount_filled, len(self._entry_active_executors),
+                    len(self._entry_done_hold_executors), len(self._entry_done_failed_executors))
+        if progress == self._last_entry_progress:
+            return
+        self._last_entry_progress = progress
+
         # Check for failed executors that exhausted retries
-        failed_entry_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda x: (x.is_done and not x.close_type == CloseType.POSITION_HOLD and
-                                   hasattr(x, 'custom_info') and
-                                   x.custom_info.get('level_id', '').startswith('entry_batch_'))
-        )
+        failed_entry_executors = self._entry_done_failed_executors
 
         if len(failed_entry_executors) > 0:
-            self.logger().warning(f"Found {len(failed_entry_executors)} failed entry executor(s)")
+            self.logger().warning("Found %s failed entry executor(s)", len(failed_entry_executors))
             # Handle failed executors - maybe adjust totals or trigger error state
 
         # Count completed entry executors
-        completed_entry_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda x: (x.is_done and x.close_type == CloseType.POSITION_HOLD and
-                                 hasattr(x, 'custom_info') and 
-                                 x.custom_info.get('level_id', '').startswith('entry_batch_'))
-        )
-        
-        self.entry_batches_completed = len(completed_entry_executors)
-        
-        # Update filled amount tracking
-        self._update_entry_fill_tracking()
+        self.entry_batches_completed = len(self._entry_done_hold_executors)
         
         # Check if entry phase is complete based on the filled amount
-        if self.entry_amount_filled >= (self.config.total_amount_quote - self.config.min_notional_size):
+        if self.entry_amount_filled >= self._entry_complete_threshold:
             # Ensure we don't count more batches than planned
             if self.entry_batches_completed > self.entry_batches_total:
                 self.logger().warning("Entry batches completed exceeds total planned batches, adjusting.")
@@ -551,18 +869,25 @@ class TWAPOrderController(DirectionalTradingControllerBase):
 
     def _complete_entry_phase(self):
         """Transition from entry to holding phase"""
+        # The size cached mid-entry may predate the last fills, re-read it before holding freezes it
+        self._filled_balance_cache.clear()
+        self._position_size = None
         self.state = ControllerState.HOLDING
-        self.entry_completion_time = time.time()
-        self.hold_start_time = time.time()
+        self.entry_completion_time = self._tick_now
+        self.hold_start_time = self._tick_now
         
         entry_duration = self.entry_completion_time - self.entry_start_time
-        self.logger().info(f"Entry phase completed in {entry_duration:.1f}s. "
-                          f"Position: {self.position_size}, Avg Price: {self.entry_avg_price:.2f}, {(self.entry_avg_price* self.position_size):.2f} {self.quote} filled")
+        position_size = self.position_size
+        # Log-only figures, float math is enough; avg price x position is the filled quote
+        filled_quote = float(self.entry_amount_filled)
+        entry_avg_price = filled_quote / float(position_size) if position_size else 0.0
+        self.logger().info("Entry phase completed in %.1fs. Position: %s, Avg Price: %.2f, %.2f %s filled",
+                           entry_duration, position_size, entry_avg_price, filled_quote, self.quote)
 
     def _check_exit_conditions(self):
         """Check if conditions are met to start exit phase"""
         if self.config.test_mode and self.hold_start_time:
-            elapsed_time = time.time() - self.hold_start_time
+            elapsed_time = self._tick_now - self.hold_start_time
             if elapsed_time >= self.config.hold_duration_seconds:
                 self._start_exit_phase()
         elif self._should_start_exit:
@@ -570,37 +895,32 @@ class TWAPOrderController(DirectionalTradingControllerBase):
 
     def _start_exit_phase(self):
         """Initialize the exit phase of TWAP trading"""
+        if self.state == ControllerState.EXITING or self.state == ControllerState.COMPLETED:
+            # A repeated exit trigger must not reset the batch timer and fire an extra batch
+            self.logger().warning("Exit already started, ignoring request in state: %s", self.state.label)
+            return
         current_position = self.position_size
-        if current_position <= Decimal("0"):
+        if current_position <= _DEC_ZERO:
             self.logger().warning("No position to exit")
-            self.state = ControllerState.COMPLETED
+            self._set_completed()
             return
             
         self.state = ControllerState.EXITING
-        self.exit_start_time = time.time()
+        self.exit_start_time = self._tick_now
         self._should_start_exit = False
         self.last_batch_time = 0  # Reset to allow immediate first batch
         
         # Calculate exit batches based on current position
-        position_value = current_position * self._last_price
-        self.exit_batches_total = int(position_value / self.config.batch_size_quote)
-        if position_value % self.config.batch_size_quote > 0:
-            self.exit_batches_total += 1
+        position_value = _to_scaled(current_position * self._last_price)
+        self.exit_batches_total = _batch_count(position_value, self._batch_quote_scaled)
             
-        self.logger().info(f"Starting TWAP exit for position {current_position} "
-                          f"in {self.exit_batches_total} batches")
+        self.logger().info("Starting TWAP exit for position %s in %s batches",
+                           current_position, self.exit_batches_total)
 
     def _monitor_exit_progress(self):
         """Monitor progress of exit batches and transition to completed when done"""
         # Count completed exit executors
-        completed_exit_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda x: (x.is_done and 
-                                 hasattr(x, 'custom_info') and 
-                                 x.custom_info.get('level_id', '').startswith('exit_batch_'))
-        )
-        
-        self.exit_batches_completed = len(completed_exit_executors)
+        self.exit_batches_completed = len(self._exit_done_executors)
         
         # Update filled amount tracking
         self._update_exit_fill_tracking()
@@ -609,17 +929,17 @@ class TWAPOrderController(DirectionalTradingControllerBase):
         if self.exit_base_amount_filled >= self.position_size:
             self._complete_exit_phase()
             if self.holding_amount > 0:
-                self.logger().warning(f"Exit phase completed with remaining position: {self.holding_amount} {self.base}")
+                self.logger().warning("Exit phase completed with remaining position: %s %s", self.holding_amount, self.base)
         # TODO: Add logic to handle partial exits if needed
 
     def _complete_exit_phase(self):
         """Complete the exit phase and transition to completed state"""
-        self.state = ControllerState.COMPLETED
-        self.exit_completion_time = time.time()
+        self._set_completed()
+        self.exit_completion_time = self._tick_now
         
         exit_duration = self.exit_completion_time - self.exit_start_time
-        self.logger().info(f"Exit phase completed in {exit_duration:.1f}s. "
-                          f"Remaining position: {self.position_size}")
+        self.logger().info("Exit phase completed in %.1fs. Remaining position: %s",
+                           exit_duration, self.position_size)
         if self._stop_when_completed:
             self._report_final_results()
             self.logger().info("TWAP Order Controller completed all operations, stopping.")
@@ -628,58 +948,74 @@ class TWAPOrderController(DirectionalTradingControllerBase):
 
     def _update_entry_fill_tracking(self):
         """Update tracking of filled entry amounts"""
+        self._reconcile_filled_amounts()
+
+    def _reconcile_filled_amounts(self):
+        """Re-read the filled amounts from the connector at most every _reconcile_interval seconds"""
+        now = self._tick_now
+        if self._last_reconcile_ts is not None and now - self._last_reconcile_ts < self._reconcile_interval:
+            return  # Fill events keep the holding amount current in between
         try:
-            filled_dict = self.connector.order_filled_balances()
-            self.entry_amount_filled = abs(filled_dict.get(self.quote, Decimal("0")))
-        except Exception as e:
-            self.logger().error(f"Error updating entry fill tracking: {e}")
+            self.holding_amount = self._get_filled(self.base)
+            self.entry_amount_filled = self._get_filled(self.quote)
+            self._last_reconcile_ts = now
+        except (KeyError, AttributeError, ConnectionError) as e:
+            # Keep the event-tracked amounts and retry on the next tick
+            self.logger().warning("Could not reconcile filled balances: %s", e)
 
     def _update_exit_fill_tracking(self):
         """Update tracking of filled exit amounts"""
-        try:
-            # For exit tracking, we need to track how much of the position has been closed
-            # This is complex with the current approach, so we'll use a simplified method
-            # completed_exit_executors = self.filter_executors(
-            #    executors=self.executors_info,
-            #    filter_func=lambda x: (x.is_done and
-            #                         hasattr(x, 'custom_info') and
-            #                         x.custom_info.get('level_id', '').startswith('exit_batch_'))
-            #)
-            
-            #total_exit_amount = Decimal("0")
-            #for executor in completed_exit_executors:
-            #    if hasattr(executor, 'filled_amount_base'):
-            #        total_exit_amount += executor.filled_amount_base
+        # For exit tracking, we need to track how much of the position has been closed
+        # This is complex with the current approach, so we'll use a simplified method
+        # completed_exit_executors = self.filter_executors(
+        #    executors=self.executors_info,
+        #    filter_func=lambda x: (x.is_done and
+        #                         hasattr(x, 'custom_info') and
+        #                         x.custom_info.get('level_id', '').startswith('exit_batch_'))
+        #)
+        
+        #total_exit_amount = Decimal("0")
+        #for executor in completed_exit_executors:
+        #    if hasattr(executor, 'filled_amount_base'):
+        #        total_exit_amount += executor.filled_amount_base
 
-            filled_dict = self.connector.order_filled_balances()
-            self.holding_amount = abs(filled_dict.get(self.base, Decimal("0")))
-            self.exit_base_amount_filled = self.position_size - self.holding_amount
-            
-        except Exception as e:
-            self.logger().error(f"Error updating exit fill tracking: {e}")
+        self._reconcile_filled_amounts()
+        self.exit_base_amount_filled = self.position_size - self.holding_amount
+
+    def _set_completed(self):
+        """Transition to COMPLETED and wake anything awaiting completion"""
+        self.state = ControllerState.COMPLETED
+        if not self._completed_future.done():
+            self._completed_future.set_result(None)
+
+    async def wait_completed(self):
+        """Wait until the controller reaches the COMPLETED state"""
+        await asyncio.shield(self._completed_future)
 
     #async def on_stop(self):
     #    self.start_exit()
-    #    while self.state != ControllerState.COMPLETED:
-    #        await asyncio.sleep(1.0)
+    #    await self.wait_completed()
 
 
 
     def _handle_error(self, error_msg: str):
         """Handle errors and transition to error state"""
+        if self.state == ControllerState.ERROR:
+            return  # Already reported, don't flood the log on repeated failures
         self.state = ControllerState.ERROR
-        self.logger().error(f"TWAP Controller Error: {error_msg}")
+        self._log.error("Error: %s", error_msg)
 
     def _report_final_results(self):
         """Report final trading results (called once when completed)"""
-        if not hasattr(self, '_results_reported'):
-            total_duration = self.exit_completion_time - self.entry_start_time
-            self.logger().info("=== TWAP Trading Completed ===")
-            self.logger().info(f"Total Duration: {total_duration:.1f}s")
-            self.logger().info(f"Entry Batches: {self.entry_batches_completed}/{self.entry_batches_total}")
-            self.logger().info(f"Exit Batches: {self.exit_batches_completed}/{self.exit_batches_total}")
-            self.logger().info(f"Final Position: {self.position_size}")
-            self._results_reported = True
+        if self._results_reported:
+            return
+        total_duration = self.exit_completion_time - self.entry_start_time
+        self.logger().info("=== TWAP Trading Completed ===")
+        self.logger().info("Total Duration: %.1fs", total_duration)
+        self.logger().info("Entry Batches: %s/%s", self.entry_batches_completed, self.entry_batches_total)
+        self.logger().info("Exit Batches: %s/%s", self.exit_batches_completed, self.exit_batches_total)
+        self.logger().info("Final Position: %s", self.position_size)
+        self._results_reported = True
 
     # Public control methods
     def start_entry(self):
@@ -688,7 +1024,7 @@ class TWAPOrderController(DirectionalTradingControllerBase):
             self._should_start_entry = True
             self.logger().info("Entry start requested")
         else:
-            self.logger().warning(f"Cannot start entry from state: {self.state}")
+            self.logger().warning("Cannot start entry from state: %s", self.state.label)
 
     def start_exit(self):
         """Public method to trigger exit phase"""
@@ -698,70 +1034,115 @@ class TWAPOrderController(DirectionalTradingControllerBase):
             self._should_start_exit = True
             self.logger().info("Exit start requested")
         else:
-            self.logger().warning(f"Cannot start exit from state: {self.state}")
+            self.logger().warning("Cannot start exit from state: %s", self.state.label)
 
     def update_strategy_markets_dict(self, markets_dict: Dict[str, Any]) -> Dict[str, Any]:
-        """Update markets dict for strategy"""
-        if self.config.connector_name not in markets_dict:
-            markets_dict[self.config.connector_name] = [self.config.trading_pair]
-        else:
-            if self.config.trading_pair not in markets_dict[self.config.connector_name]:
-                markets_dict[self.config.connector_name].append(self.config.trading_pair)
+        """Update markets dict for strategy (pairs are kept as sets, O(1) membership)"""
+        pairs = markets_dict.get(self.config.connector_name)
+        if pairs is None:
+            markets_dict[self.config.connector_name] = {self.config.trading_pair}
+        elif isinstance(pairs, set):
+            pairs.add(self.config.trading_pair)
+        elif self.config.trading_pair not in pairs:
+            # List built by another controller, keep its type
+            pairs.append(self.config.trading_pair)
         return markets_dict
 
     def to_format_status(self) -> List[str]:
         """Format status information for display"""
-        lines = []
-        lines.append(f"Controller: {self.config.controller_name}")
-        lines.append(f"State: {self.state.value}")
-        lines.append(f"Trading Pair: {self.config.trading_pair}")
-        lines.append(f"Total Amount: {self.config.total_amount_quote} quote")
-        lines.append(f"Batch Size: {self.config.batch_size_quote} quote")
-        lines.append(f"Batch Interval: {self.config.batch_interval}s")
+        if self._format_status_cache_rev != self._status_rev:
+            now = time.monotonic()
+            if now - self._format_status_cache_ts >= self._status_debounce:
+                self._format_status_cache = self._build_format_status()
+                self._format_status_cache_rev = self._status_rev
+                self._format_status_cache_ts = now
+        return self._format_status_cache
+
+    def _build_static_status_lines(self):
+        """Format the status lines that only change with the config"""
+        self._static_status_lines = [
+            f"Trading Pair: {self.config.trading_pair}",
+            f"Total Amount: {self.config.total_amount_quote} quote",
+            f"Batch Size: {self.config.batch_size_quote} quote",
+            f"Batch Interval: {self.config.batch_interval}s",
+        ]
+
+    def _build_format_status(self) -> List[str]:
+        """Build the status lines shown by to_format_status"""
+        lines = [self._status_name_line, f"State: {self.state.label}"]
+        lines.extend(self._static_status_lines)
         lines.append(f"Position Size: {self.position_size}")
         lines.append(f"Entry Avg Price: {self.entry_avg_price}")
         lines.append(f"Current Price: {self._last_price}")
 
         # Progress information
-        if self.state == ControllerState.ENTERING:
-            lines.append(f"Entry Progress: {self.entry_batches_completed}/{self.entry_batches_total}")
-            if self.entry_start_time:
-                elapsed = time.time() - self.entry_start_time
-                lines.append(f"Entry Duration: {elapsed:.1f}s")
-                
-        elif self.state == ControllerState.HOLDING:
-            if self.hold_start_time:
-                hold_elapsed = time.time() - self.hold_start_time
-                hold_remaining = max(0, self.config.hold_duration_seconds - hold_elapsed)
-                lines.append(f"Hold Remaining: {hold_remaining:.1f}s")
-                
-        elif self.state == ControllerState.EXITING:
-            lines.append(f"Exit Progress: {self.exit_batches_completed}/{self.exit_batches_total}")
-            if self.exit_start_time:
-                elapsed = time.time() - self.exit_start_time
-                lines.append(f"Exit Duration: {elapsed:.1f}s")
+        renderer = self._status_renderers.get(self.state)
+        if renderer is not None:
+            # Phase start times come from the market clock, read it once per render
+            lines.extend(renderer(self.market_data_provider.time()))
 
         # Active executors
-        active_executors = len([e for e in self.executors_info if e.is_active])
-        lines.append(f"Active Orders: {active_executors}")
+        lines.append(f"Active Orders: {self._active_executor_count}")
+
+        return lines
 
+    def _render_entering(self, now: float) -> List[str]:
+        """Entry progress lines"""
+        lines = [f"Entry Progress: {self.entry_batches_completed}/{self.entry_batches_total}"]
+        if self.entry_start_time:
+            elapsed = now - self.entry_start_time
+            lines.append(f"Entry Duration: {elapsed:.1f}s")
         return lines
 
+    def _render_holding(self, now: float) -> List[str]:
+        """Hold countdown line"""
+        if not self.hold_start_time:
+            return []
+        hold_elapsed = now - self.hold_start_time
+        hold_remaining = max(0, self.config.hold_duration_seconds - hold_elapsed)
+        return [f"Hold Remaining: {hold_remaining:.1f}s"]
+
+    def _render_exiting(self, now: float) -> List[str]:
+        """Exit progress lines"""
+        lines = [f"Exit Progress: {self.exit_batches_completed}/{self.exit_batches_total}"]
+        if self.exit_start_time:
+            elapsed = now - self.exit_start_time
+            lines.append(f"Exit Duration: {elapsed:.1f}s")
+        return lines
+
+    def get_controller_status_view(self) -> ControllerStatusView:
+        """Get detailed controller status as a snapshot object"""
+        if self._status_cache_rev != self._status_rev:
+            now = time.monotonic()
+            if now - self._status_cache_ts >= self._status_debounce:
+                self._status_view = self._build_controller_status()
+                self._status_cache_rev = self._status_rev
+                self._status_cache_ts = now
+        return self._status_view
+
     def get_controller_status(self) -> Dict[str, Any]:
         """Get detailed controller status as dictionary"""
-        return {
-            "controller_name": self.config.controller_name,
-            "state": self.state.value,
-            "trading_pair": self.config.trading_pair,
-            "total_amount_quote": float(self.config.total_amount_quote),
-            "batch_size_quote": float(self.config.batch_size_quote),
-            "position_size": float(self.position_size),
-            "entry_avg_price": float(self.entry_avg_price),
-            "current_price": float(self._last_price),
-            "entry_batches_completed": self.entry_batches_completed,
-            "entry_batches_total": self.entry_batches_total,
-            "exit_batches_completed": self.exit_batches_completed,
-            "exit_batches_total": self.exit_batches_total,
-            "entry_amount_filled": float(self.entry_amount_filled),
-            "exit_amount_filled": float(self.exit_amount_filled),
-        }
+        view = self.get_controller_status_view()
+        if self._status_cache_view is not view:
+            self._status_cache = asdict(view)
+            self._status_cache_view = view
+        return self._status_cache
+
+    def _build_controller_status(self) -> ControllerStatusView:
+        """Build the snapshot returned by get_controller_status_view"""
+        return ControllerStatusView(
+            controller_name=self.config.controller_name,
+            state=self.state.label,
+            trading_pair=self.config.trading_pair,
+            total_amount_quote=float(self.config.total_amount_quote),
+            batch_size_quote=float(self.config.batch_size_quote),
+            position_size=float(self.position_size),
+            entry_avg_price=float(self.entry_avg_price),
+            current_price=float(self._last_price),
+            entry_batches_completed=self.entry_batches_completed,
+            entry_batches_total=self.entry_batches_total,
+            exit_batches_completed=self.exit_batches_completed,
+            exit_batches_total=self.exit_batches_total,
+            entry_amount_filled=float(self.entry_amount_filled),
+            exit_amount_filled=float(self.exit_amount_filled),
+        )
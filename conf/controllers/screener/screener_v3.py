@@ -1,13 +1,17 @@
+import asyncio
 import logging
+from dataclasses import dataclass
+import os
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-import json
-from typing import Any, Dict
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from pandas import DataFrame
 from pydantic import Field, field_validator
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import hummingbot
 from hummingbot.client.config.config_data_types import ClientFieldData
@@ -26,11 +30,295 @@ from hummingbot.remote_iface.mqtt import ETopicPublisher
 from tmc_lib.Klaman import KF
 from tmc_lib.candles_util import DataUtil
 
-import pandas_ta as ta  # noqa: F401
+# bottleneck's moving window functions are C loops, numpy windows are used without it
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+# TA-Lib computes NATR in C, pandas_ta used it too when installed
+try:
+    import talib
+except ImportError:
+    talib = None
+
+# numba compiles the single pass rolling z-score kernel, the numpy windows are used without it
+try:
+    from numba import njit, types as nb
+except ImportError:
+    njit = None
 
 TG_VERBOSE = True
 
 
+@lru_cache(maxsize=None)
+def _interval_seconds(interval: str) -> int:
+    """
+    DataUtil.get_seconds_from_interval memoized per interval string
+    """
+    return DataUtil.get_seconds_from_interval(interval)
+
+
+def _last_value(df: pd.DataFrame, column: str) -> Any:
+    """
+    Last value of a column read from its array, skipping the iloc indexer
+    """
+    return df[column].to_numpy()[-1]
+
+
+def _rolling_mean_std(values: np.ndarray, window: int, ddof: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling mean and standard deviation over a 1D array, NaN until the first full window
+    """
+    if bn is not None and len(values) >= window:
+        return (bn.move_mean(values, window, min_count=window),
+                bn.move_std(values, window, min_count=window, ddof=ddof))
+    mean = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)
+        mean[window - 1:] = windows.mean(axis=1)
+        std[window - 1:] = windows.std(axis=1, ddof=ddof)
+    return mean, std
+
+
+def _rolling_zscore_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling z-score in one pass, Welford mean/M2 updated as each value enters and leaves the window.
+    A window holding a NaN (or with zero variance) gives NaN, like pandas rolling.
+    """
+    n_values = len(values)
+    out = np.full(n_values, np.nan)
+    nobs = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n_values):
+        value = values[i]
+        if not np.isnan(value):
+            nobs += 1
+            delta = value - mean
+            mean += delta / nobs
+            m2 += delta * (value - mean)
+        if i >= window:
+            old = values[i - window]
+            if not np.isnan(old):
+                nobs -= 1
+                if nobs == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = old - mean
+                    mean -= delta / nobs
+                    m2 -= delta * (old - mean)
+        if nobs == window and window > 1:
+            var = m2 / (window - 1)
+            if var > 0.0:
+                out[i] = (value - mean) / np.sqrt(var)
+    return out
+
+
+# Explicit signatures compile when the module is imported, so the first screener tick never waits on
+# the JIT. The compiled kernels are cached on disk only when NUMBA_CACHE_DIR points to a writable
+# directory, the default __pycache__ next to this file sits on the (possibly read-only) conf mount.
+# Inputs are typed as read-only arrays of any layout, which also accepts writeable ones. fastmath is
+# left off, it lets the compiler drop the NaN checks.
+_NUMBA_CACHE = bool(os.environ.get("NUMBA_CACHE_DIR"))
+
+if njit is not None:
+    _F8_1D = nb.Array(nb.float64, 1, 'A', readonly=True)
+    _F8_2D = nb.Array(nb.float64, 2, 'A', readonly=True)
+    _rolling_zscore_jit = njit(nb.float64[:](_F8_1D, nb.int64), cache=_NUMBA_CACHE)(_rolling_zscore_kernel)
+else:
+    _rolling_zscore_jit = None
+
+
+_zscore_impl = _rolling_zscore_jit if _rolling_zscore_jit is not None else _rolling_zscore_kernel
+
+
+def _trend_features_kernel(close: np.ndarray, kalman: np.ndarray, trend_interval: int,
+                           pct_change_interval: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Trend features in one call over the close and the Kalman states stacked as rows (a, v, a2, v2):
+    the rolling z-score of each state (same rows), the trend polarity and the pct return of the close
+    """
+    n_values = len(close)
+    zscores = np.empty(kalman.shape)
+    for k in range(kalman.shape[0]):
+        zscores[k] = _zscore_impl(kalman[k], trend_interval)
+    polarity = np.empty(n_values, dtype=np.bool_)
+    price_ret = np.full(n_values, np.nan)
+    for i in range(n_values):
+        polarity[i] = kalman[1, i] * kalman[3, i] > 0.0
+        if i >= pct_change_interval:
+            price_ret[i] = close[i] / close[i - pct_change_interval] - 1.0
+    return zscores, polarity, price_ret
+
+
+if njit is not None:
+    _TREND_FEATURES_SIG = nb.Tuple((nb.float64[:, :], nb.boolean[:], nb.float64[:]))(
+        _F8_1D, _F8_2D, nb.int64, nb.int64)
+    # not parallel, the kernel already runs on the analysis thread pool and numba's workqueue
+    # threading layer aborts on concurrent parallel regions
+    _trend_features_jit = njit(_TREND_FEATURES_SIG, cache=_NUMBA_CACHE)(_trend_features_kernel)
+else:
+    _trend_features_jit = None
+
+
+def _trend_features(close: np.ndarray, kalman: np.ndarray, trend_interval: int,
+                    pct_change_interval: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    _trend_features_kernel compiled with numba, numpy equivalent without it
+    """
+    if _trend_features_jit is not None:
+        return _trend_features_jit(close, kalman, trend_interval, pct_change_interval)
+    zscores = np.vstack([_rolling_zscore(row, trend_interval) for row in kalman])
+    polarity = kalman[1] * kalman[3] > 0.0
+    price_ret = np.full(len(close), np.nan)
+    price_ret[pct_change_interval:] = close[pct_change_interval:] / close[:-pct_change_interval] - 1.0
+    return zscores, polarity, price_ret
+
+
+def _rolling_zscore(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Distance of each value to its rolling mean in rolling (sample) standard deviations, numpy fallback
+    of _rolling_zscore_kernel
+    """
+    mean, std = _rolling_mean_std(values, window, ddof=1)
+    return (values - mean) / std
+
+
+def _percentile_of_score(values: np.ndarray) -> np.ndarray:
+    """
+    Share of the values <= each value, over len - 1 (NaN never counts and scores 0)
+    """
+    finite = np.sort(values[~np.isnan(values)])
+    counts = np.searchsorted(finite, values, side='right').astype(float)
+    counts[np.isnan(values)] = 0.0
+    return counts / (len(values) - 1)
+
+
+def _natr(high: np.ndarray, low: np.ndarray, close: np.ndarray, length: int) -> np.ndarray:
+    """
+    Normalized ATR, same as pandas_ta.natr: TA-Lib's NATR when available,
+    otherwise 100 * EMA(true range) / close with the EMA seeded by an SMA
+    """
+    if talib is not None:
+        return talib.NATR(high, low, close, timeperiod=length)
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    true_range = np.maximum.reduce([high - low, np.abs(high - prev_close), np.abs(prev_close - low)])
+
+    seeded = true_range.copy()
+    if len(seeded) >= length:
+        seeded[length - 1] = np.nanmean(true_range[:length])
+    seeded[:length - 1] = np.nan
+    atr = pd.Series(seeded).ewm(span=length, adjust=False).mean().to_numpy()
+    return 100.0 * atr / close
+
+
+@dataclass(frozen=True, slots=True)
+class IndicatorParams:
+    """
+    Screener config values read by get_indicators, copied once from the pydantic config
+    """
+    volatility_interval: int
+    trend_interval: int
+    pct_change_interval: int
+    kf_fast_gain: float
+    kf_slow_gain: float
+    kf_slower_gain: float
+    candles_interval: str
+    virtual_interval: str
+
+    @classmethod
+    def from_config(cls, config: "KalmanFilterNewtoninan") -> "IndicatorParams":
+        return cls(
+            volatility_interval=config.volatility_interval,
+            trend_interval=config.trend_interval,
+            pct_change_interval=config.pct_change_interval,
+            kf_fast_gain=config.kf_fast_gain,
+            kf_slow_gain=config.kf_slow_gain,
+            kf_slower_gain=config.kf_slower_gain,
+            candles_interval=config.candles_interval,
+            virtual_interval=config.virtual_interval,
+        )
+
+
+def get_indicators(candle, trading_pair_interval: str, params: IndicatorParams, dbar: bool = False) -> pd.DataFrame:
+    """
+    Bars of the asset with the volatility, bbands, Kalman filter and trend metrics appended
+    """
+    window = params.volatility_interval
+    trend_interval = params.trend_interval
+    fast_gain, slow_gain, slower_gain = params.kf_fast_gain, params.kf_slow_gain, params.kf_slower_gain
+
+    # work on views of the feed's arrays, the frame is copied once when the new columns are joined
+    bars_df = candle.dbars_df if dbar else candle.candles_df
+    close = bars_df["close"].to_numpy(dtype=float)
+    high = bars_df["high"].to_numpy(dtype=float)
+    low = bars_df["low"].to_numpy(dtype=float)
+
+    # adding volatility metrics
+    returns = np.empty_like(close)
+    returns[0] = np.nan
+    returns[1:] = close[1:] / close[:-1] - 1.0
+    volatility = _rolling_mean_std(returns, window, ddof=1)[1]
+    volatility_pct = volatility / close
+
+    # adding bbands metrics (2 std bands around the SMA, population std like pandas_ta)
+    bb_mid, bb_std = _rolling_mean_std(close, window)
+    bb_range = 4.0 * bb_std
+    bbands_width_pct = 100.0 * bb_range / bb_mid
+
+    metrics = {
+        "interval": params.virtual_interval if dbar else params.candles_interval,
+        "base": trading_pair_interval,
+        "volatility": volatility,
+        "volatility_pct": volatility_pct,
+        "volatility_pct_mean": _rolling_mean_std(volatility_pct, window)[0],
+        "bbands_width_pct": bbands_width_pct,
+        "bbands_width_pct_mean": _rolling_mean_std(bbands_width_pct, window)[0],
+        "bbands_percentage": (close - (bb_mid - 2.0 * bb_std)) / bb_range,
+        "natr": _natr(high, low, close, window),
+    }
+    df = pd.concat([bars_df, pd.DataFrame(metrics, index=bars_df.index)], axis=1)
+
+    # adding Kalman filter
+    if dbar:
+        df = KF.kalman3_dollar(df, key='close', gain=fast_gain, gain2=slow_gain, gain3=slower_gain)
+    else:
+        interval_in_s = candle.interval_to_seconds[params.candles_interval]
+        df = KF.kalman3_tbars(df, interval_in_s, key='close', gain=fast_gain, gain2=slow_gain, gain3=slower_gain)
+    kf = {column: df[column].to_numpy(dtype=float) for column in ('x', 'x2', 'v', 'v2', 'a', 'a2')}
+
+    # sample std of the close over the trend window, rescaled from the bbands pass when the windows match
+    if trend_interval == window and window > 1:
+        close_std = bb_std * np.sqrt(window / (window - 1))
+    else:
+        close_std = _rolling_mean_std(close, trend_interval, ddof=1)[1]
+    df['price_zscore'] = (close - kf['x']) / close_std
+    df['price_zscore2'] = (close - kf['x2']) / close_std
+
+    df['kf_delta'] = kf['x'] - kf['x2']
+
+    # z-scores of both kalman filters, polarity (True if v and v2 have the same sign) and pct change of the price
+    kalman = np.vstack([kf['a'], kf['v'], kf['a2'], kf['v2']])
+    zscores, polarity, price_ret = _trend_features(close, kalman, trend_interval, params.pct_change_interval)
+    df['a_zscore'] = zscores[0]
+    df['v_zscore'] = zscores[1]
+    # compute this for the second kalman filter
+    df['a_zscore2'] = zscores[2]
+    df['v_zscore2'] = zscores[3]
+
+    df['trend_polarity'] = polarity
+
+    df['price_%ret'] = price_ret
+    df['percentile_%ret'] = _percentile_of_score(price_ret)
+
+    return df
+
+
 class TestModeOptions:
     ALWAYS_REBALANCE = 1
     STANDARD = 0
@@ -240,6 +528,7 @@ class KalmanFilterNewtoninan(ControllerConfigBase):
 
 class KalmanFilterNewtoninanController(ControllerBase):
     _logger = None
+    _shared_app = None
 
     @classmethod
     def logger(cls) -> HummingbotLogger:
@@ -247,14 +536,20 @@ class KalmanFilterNewtoninanController(ControllerBase):
             cls._logger = logging.getLogger('Screener controller')
         return cls._logger
 
+    @classmethod
+    def main_app(cls) -> HummingbotApplication:
+        if cls._shared_app is None:
+            cls._shared_app = HummingbotApplication.main_application()
+        return cls._shared_app
+
     def __init__(self, config: KalmanFilterNewtoninan, *args, **kwargs):
 
         self.report_metrics = config.report_metrics
         self.report_candles = config.report_candles
 
         # Calculate records before calling super().__init__
-        self.n_records2dbars = int(DataUtil.get_seconds_from_interval(
-            config.dbars_lookback) / DataUtil.get_seconds_from_interval(config.candles_interval))
+        self.n_records2dbars = int(_interval_seconds(config.dbars_lookback) /
+                                   _interval_seconds(config.candles_interval))
 
         self.max_records = int(self.n_records2dbars + 10)
 
@@ -279,9 +574,12 @@ class KalmanFilterNewtoninanController(ControllerBase):
         ]
         #
         ## Try to enable MQTT autostart before calling super().__init__
+        self._app = None
+        self.mqtt_pub = None
+        self._mqtt_gateway = None
         try:
             # Access the app through various possible paths
-            self._app = HummingbotApplication.main_application()
+            self._app = self.main_app()
             if not self._app.client_config_map.mqtt_bridge.mqtt_autostart:
                 self.mqtt_pub = None
                 raise AttributeError("MQTT autostart is not enabled")
@@ -307,6 +605,7 @@ class KalmanFilterNewtoninanController(ControllerBase):
 
         # Initialize candles dictionary and last_timestamp tracking
         self.candles = {}
+        self._feed_key_to_base: Dict[str, str] = {}
         self.candles_started = False
 
         # Initialize other existing attributes...
@@ -314,9 +613,6 @@ class KalmanFilterNewtoninanController(ControllerBase):
         self.dbars_updated = False
         self.market_status_metrics_df = None
         self.metrics_updated = None
-        self.config = config
-        self.config.max_records = self.max_records
-        self.config.n_records2dbars = self.n_records2dbars
 
         self.base_dir = str(hummingbot.root_path())
         self.top = None
@@ -324,21 +620,63 @@ class KalmanFilterNewtoninanController(ControllerBase):
         self.df_comparison = None
         self.last_time_reported = 0
         self.dbars = config.dbars
-        self.candles_interval = config.candles_interval
-        self.fast_gain = config.kf_fast_gain
-        self.slow_gain = config.kf_slow_gain
-        self.slower_gain = config.kf_slower_gain
-        self.volatility_interval = config.volatility_interval
-        self.trend_interval = config.trend_interval
-        self.pct_change_interval = config.pct_change_interval
+        # indicator windows, gains and intervals, the single source get_indicators reads
+        self._indicator_params = IndicatorParams.from_config(config)
         self.market_analysis_initialized = False
-        self.virtual_interval = config.virtual_interval
+        # ranking settings read on every update
+        self.n_pairs = config.n_pairs
+        self.sort_values_by = list(config.sort_values_by)
+        self.filter_polarity = config.filter_polarity
         self.notifications = None  # we will use this to send notifications to the main strategy and post them to the app
+        # base -> (last bar timestamp, indicators df) so a publish reuses what update_dbars computed
+        self._indicator_cache: Dict[str, Tuple[Any, pd.DataFrame]] = {}
+        # side -> (rows rendered, text) of the last notification table
+        self._render_cache: Dict[str, Tuple[tuple, str]] = {}
+        # base -> timestamp of the last bar sent in the candles payload
+        self._last_published_ts: Dict[str, Any] = {}
+        # the full candle history is re-sent this often so late or lossy subscribers catch up
+        self._candles_snapshot_interval = 300.0
+        self._last_candles_snapshot: Optional[float] = None
+        # latest metrics per asset kept as one array per column, the DataFrame view is rebuilt when read after a write
+        self._metric_columns: Dict[str, np.ndarray] = {}
+        self._metric_rows: Dict[str, int] = {}
+        self._metrics_index: List[str] = []
+        self._all_metrics_df: Optional[pd.DataFrame] = None
+        self._metrics_dirty = False
+        # bumped on every metrics write, part of the key that lets publish_mqtt_ranking skip unchanged payloads
+        self._metrics_rev = 0
+        self._last_publish_key: Optional[tuple] = None
         if TG_VERBOSE:
             self.notifications = "HL Long/Short Screener started!"
 
 
 
+    @property
+    def all_metrics_df(self) -> Optional[pd.DataFrame]:
+        if self._metrics_dirty:
+            self._all_metrics_df = pd.DataFrame(self._metric_columns, index=self._metrics_index)
+            self._metrics_dirty = False
+        return self._all_metrics_df
+
+    @all_metrics_df.setter
+    def all_metrics_df(self, df: pd.DataFrame) -> None:
+        self._metric_columns = {column: df[column].to_numpy(copy=True) for column in df.columns}
+        self._metrics_index = list(df.index)
+        self._metric_rows = {base: row for row, base in enumerate(self._metrics_index)}
+        self._all_metrics_df = df
+        self._metrics_dirty = False
+        self._metrics_rev += 1
+
+    def _store_metrics(self, base: str, indicators_df: pd.DataFrame) -> None:
+        """
+        Write the asset's latest indicators into the metric columns
+        """
+        row = self._metric_rows[base]
+        for column, values in self._metric_columns.items():
+            values[row] = indicators_df[column].to_numpy()[-1]
+        self._metrics_dirty = True
+        self._metrics_rev += 1
+
     def publish_mqtt_ranking(self, new_top: List[str] = None, new_bottom: List[str] = None,
                                 old_top: List[str] = None, old_bottom: List[str] = None):
         """
@@ -348,99 +686,44 @@ class KalmanFilterNewtoninanController(ControllerBase):
             return
 
         try:
+            if self.top is None or self.bottom is None:
+                self.logger().warning("No ranking available yet, nothing to publish")
+                return
+
+            # nothing to tell the subscribers if the selection, the reported fields and the metrics are the same
+            publish_key = (tuple(self.top['base']), tuple(self.bottom['base']), self.report_metrics,
+                           self.report_candles, self._metrics_rev)
+            now = self.market_data_provider.time()
+            candles_snapshot = self.report_candles and (
+                self._last_candles_snapshot is None
+                or now - self._last_candles_snapshot >= self._candles_snapshot_interval)
+            if publish_key == self._last_publish_key and not candles_snapshot \
+                    and not (new_top or new_bottom or old_top or old_bottom):
+                return
+
             # Get MQTT gateway from the application
             # publisher = self.mqtt_pub
 
-            if self.mqtt_pub is None or not self._app._mqtt.health:
+            if self.mqtt_pub is None or not self._mqtt_healthy():
                 self.logger().warning("MQTT gateway not available or not healthy")
                 return
 
+            if candles_snapshot:
+                self._last_published_ts.clear()
+
             report_keys = ["v2", "v", "price_zscore", "price_zscore2", "bbands_width_pct", "bbands_percentage", "natr",
                            "price_%ret", "percentile_%ret"]
 
-            detailed_top_assets_data = {}
             candles_to_report = {}
+            detailed_top_assets_data = {}
             if self.top is not None and not self.top.empty and (self.report_metrics or self.report_candles):
-                i = 1
-                for idx, row in self.top.iterrows():
-                    base = row.get('base', '')
-
-                    if self.report_metrics and not self.report_candles:
-                        asset_data = {
-                            "rank": int(i),
-                            "base": str(base),
-                            "price": self.candles[base].candles_df['close'].iloc[-1],
-                        }
-
-                        for key in report_keys:
-                            asset_data[key] = self.all_metrics_df[key].get(base,0.0)
-
-                    else:
-                        try:
-                            candles_w_indicators = self.get_indicators(self.candles[base], base, config=self.config,
-                                                                   dbar=self.config.dbars)
-                            indicators = candles_w_indicators.iloc[-1]
-                        except:
-                            candles_w_indicators = None
-                            indicators = None
-                        asset_data = {
-                            "rank": int(indicators.get('rank', i)),
-                            "base": str(indicators.get('base', '')),
-                            "price": float(indicators.get('close', 0.0)),
-                        }
-                        for key in report_keys:
-                            asset_data[key] = float(indicators.get(key, 0.0))
-
-                        candles_to_report[
-                            base] = candles_w_indicators.dropna().to_dict() if candles_w_indicators is not None else None
-
-                    if self.report_metrics: detailed_top_assets_data[base] = asset_data
-                    i += 1
-
-            # Prepare bottom assets data
-            bottom_assets_data = {
-                "timestamp": pd.Timestamp.now().isoformat(),
-                "type": "bottom_assets",
-                "count": len(self.bottom),
-                "assets": []
-            }
+                detailed_top_assets_data = self._collect_assets_data(self.top, 1, report_keys, candles_to_report)
+
             detailed_bottom_assets_data = {}
 
             if self.bottom is not None and not self.bottom.empty and (self.report_metrics or self.report_candles):
-                i = 0
-                for idx, row in self.bottom.iterrows():
-                    base = row.get('base', '')
-                    if self.report_metrics and not self.report_candles:
-                        asset_data = {
-                            "rank": int(i),
-                            "base": str(base),
-                            "price": self.candles[base].candles_df['close'].iloc[-1],
-                        }
-
-                        for key in report_keys:
-                            asset_data[key] = self.all_metrics_df[key].get(base, 0.0)
-
-                    else:
-                        try:
-                            candles_w_indicators = self.get_indicators(self.candles[base], base, config=self.config,
-                                                                       dbar=self.config.dbars)
-                            indicators = candles_w_indicators.iloc[-1]
-                        except:
-                            candles_w_indicators = None
-                            indicators = None
-                        asset_data = {
-                            "rank": int(indicators.get('rank', i)),
-                            "base": str(indicators.get('base', '')),
-                            "price": float(indicators.get('close', 0.0)),
-                        }
-                        for key in report_keys:
-                            asset_data[key] = float(indicators.get(key, 0.0))
-
-                        candles_to_report[
-                            base] = candles_w_indicators.dropna().to_dict() if candles_w_indicators is not None else None
-
-                    if self.report_metrics: detailed_bottom_assets_data[base] = asset_data
-                    i += 1
+                detailed_bottom_assets_data = self._collect_assets_data(self.bottom, 0, report_keys,
+                                                                        candles_to_report)
 
             # Publish to MQTT
             #if self.report_all_metrics:
@@ -459,17 +742,88 @@ class KalmanFilterNewtoninanController(ControllerBase):
                 payload["detailed_bottom_assets"] = detailed_bottom_assets_data
             if self.report_candles:
                 payload["candles"] = candles_to_report
+                # a snapshot carries the whole history, otherwise only the bars from the last one published on
+                payload["candles_snapshot"] = candles_snapshot
 
             #topic = f"{self.config.mqtt_topic_prefix}"
             #publisher.publish(combined_topic, combined_data)
             #test_payload = {'test_key': 'test_value'}
             self.mqtt_pub.send(payload)
+            for base, candles in candles_to_report.items():
+                if candles and candles["timestamp"]:
+                    self._last_published_ts[base] = candles["timestamp"][-1]
+            if candles_snapshot:
+                self._last_candles_snapshot = now
+            self._last_publish_key = publish_key
             # publisher.send(combined_data)
             self.logger().info(f"Published combined ranking to MQTT topic: {self.config.mqtt_topic_prefix}")
 
         except Exception as e:
             self.logger().error(f"Failed to publish MQTT ranking data: {str(e)}")
 
+    def _mqtt_healthy(self) -> bool:
+        """
+        Health of the MQTT bridge, the gateway handle is looked up again only when missing or unhealthy
+        """
+        gateway = self._mqtt_gateway
+        if gateway is None or not gateway.health:
+            # the bridge may have been (re)started since the last lookup
+            gateway = self._mqtt_gateway = getattr(self._app, '_mqtt', None)
+        return gateway is not None and gateway.health
+
+    def _collect_assets_data(self, ranked: pd.DataFrame, first_rank: int, report_keys: List[str],
+                             candles_to_report: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the detailed MQTT entry of each ranked asset, filling candles_to_report when candles are reported
+        """
+        assets_data = {}
+        bases = ranked['base'].to_numpy()
+
+        if self.report_metrics and not self.report_candles:
+            # one block read of the metrics instead of a boxed Series per row
+            metrics = self.all_metrics_df.loc[bases, report_keys].to_numpy(dtype=float)
+            for rank, (base, values) in enumerate(zip(bases, metrics), start=first_rank):
+                asset_data = {
+                    "rank": rank,
+                    "base": str(base),
+                    "price": _last_value(self.candles[base].candles_df, 'close'),
+                }
+                asset_data.update(zip(report_keys, values.tolist()))
+                assets_data[base] = asset_data
+            return assets_data
+
+        for rank, base in enumerate(bases, start=first_rank):
+            try:
+                candles_w_indicators = self._get_indicators_cached(self.candles[base], base)
+                indicators = candles_w_indicators.iloc[-1]
+            except:
+                candles_w_indicators = None
+                indicators = None
+            asset_data = {
+                "rank": int(indicators.get('rank', rank)),
+                "base": str(indicators.get('base', '')),
+                "price": float(indicators.get('close', 0.0)),
+            }
+            for key in report_keys:
+                asset_data[key] = float(indicators.get(key, 0.0))
+
+            candles_to_report[base] = self._new_candles_payload(base, candles_w_indicators)
+
+            if self.report_metrics: assets_data[base] = asset_data
+        return assets_data
+
+    def _new_candles_payload(self, base: str, candles_w_indicators: Optional[pd.DataFrame]) -> Optional[Dict[str, list]]:
+        """
+        Bars of the asset from the last published one on, as column lists. The last published bar is sent
+        again since it may still have been forming
+        """
+        if candles_w_indicators is None:
+            return None
+        # the bars are time ordered, the previously published rows are skipped without a mask over the history
+        timestamps = candles_w_indicators["timestamp"].to_numpy()
+        start = np.searchsorted(timestamps, self._last_published_ts.get(base, -np.inf), side='left')
+        return candles_w_indicators.iloc[start:].dropna().to_dict(orient='list')
+
     async def update_processed_data(self):
         """
         Update the processed data based on the current state of the strategy.
@@ -477,13 +831,12 @@ class KalmanFilterNewtoninanController(ControllerBase):
         # if candles are not started, create the candles dict and set the timer to 0 for each of them
         if not self.candles_started:
             self.logger().info("Initializing candles...")
-            _ = len(self.config.candles_quote_asset)
-            for key, candle in self.market_data_provider.candles_feeds.items():
-                pair = key.split('_')[-2]
-                key = f"{pair[:-_]}"
-                self.candles[key] = candle
+            candles_feeds = self.market_data_provider.candles_feeds
+            self._feed_key_to_base = self._map_feed_keys(candles_feeds.keys())
+            for feed_key, base in self._feed_key_to_base.items():
+                self.candles[base] = candles_feeds[feed_key]
                 # initialize the last timestamp to 0
-                self.candles[key].last_timestamp = 0
+                self.candles[base].last_timestamp = 0
             self.candles_started = True
 
         # if market analysis is not initialized call the function
@@ -499,13 +852,33 @@ class KalmanFilterNewtoninanController(ControllerBase):
             self.raking_updated = False
             if not self.notifications: self.notifications = ""
 
-            self.notifications += f"Top {self.config.n_pairs} pairs: \n {self.top[self.config.columns_to_report].to_string()} \n\n" \
-                                  f"Bottom {self.config.n_pairs} pairs: \n {self.bottom[self.config.columns_to_report].to_string()}" \
+            self.notifications += f"Top {self.config.n_pairs} pairs: \n {self._render_table('top', self.top)} \n\n" \
+                                  f"Bottom {self.config.n_pairs} pairs: \n {self._render_table('bottom', self.bottom)}" \
                                   f"\n \n --------------------------------------------------------"
             #self.publish_mqtt_ranking()
 
 
 
+    def _map_feed_keys(self, feed_keys) -> Dict[str, str]:
+        """
+        Map the candle feed keys (connector_PAIRQUOTE_interval) to their base asset, in a stable order
+        """
+        quote_len = len(self.config.candles_quote_asset)
+        return {feed_key: feed_key.split('_')[-2][:-quote_len] for feed_key in sorted(feed_keys)}
+
+    def _render_table(self, side: str, ranked: pd.DataFrame) -> str:
+        """
+        to_string of the reported columns, reused while the side's rows and values are unchanged
+        """
+        table = ranked[self.config.columns_to_report]
+        key = tuple(table.itertuples(name=None))
+        cached = self._render_cache.get(side)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        text = table.to_string()
+        self._render_cache[side] = (key, text)
+        return text
+
     def report_candles_not_ready(self):
         """
         Report the candles that are not ready to be used for the market analysis
@@ -517,10 +890,10 @@ class KalmanFilterNewtoninanController(ControllerBase):
     async def initialize_market_analysis(self):
         if all(candle.dbar_ready for candle in self.candles.values()):
             self.logger().info("all candles are ready! ... initializing market analysis")
-            self.all_metrics_df, self.market_status_metrics_df = self.create_market_analysis()
+            self.all_metrics_df, self.market_status_metrics_df = await self.create_market_analysis()
 
-            current_top, current_bottom = self.get_ranking(self.all_metrics_df, self.config.sort_values_by,
-                                                           self.config.n_pairs)
+            current_top, current_bottom = self.get_ranking(self.all_metrics_df, self.sort_values_by,
+                                                           self.n_pairs)
 
             self.top = current_top
             self.bottom = current_bottom
@@ -531,24 +904,25 @@ class KalmanFilterNewtoninanController(ControllerBase):
     def update_ranking(self):
         # update raking
         if self.metrics_updated:
-            current_top, current_bottom = self.get_ranking(self.all_metrics_df, self.config.sort_values_by,
-                                                           self.config.n_pairs)
+            current_top, current_bottom = self.get_ranking(self.all_metrics_df, self.sort_values_by,
+                                                           self.n_pairs)
 
             # check which asset have changed
-            top_changed = self.top.index.difference(current_top.index)
-            bottom_changed = self.bottom.index.difference(current_bottom.index)
+            current_top_bases = current_top['base'].tolist()
+            current_bottom_bases = current_bottom['base'].tolist()
+            previous_top_bases = self.top['base'].tolist()
+            previous_bottom_bases = self.bottom['base'].tolist()
+            current_top_set, previous_top_set = set(current_top_bases), set(previous_top_bases)
+            current_bottom_set, previous_bottom_set = set(current_bottom_bases), set(previous_bottom_bases)
 
             self.metrics_updated = False
-            if len(top_changed) > 0 or len(bottom_changed) > 0:
+            if current_top_set != previous_top_set or current_bottom_set != previous_bottom_set:
                 self.logger().info("Raking updated!")
-                new_top_assets = [new_base for new_base in list(current_top.base) if
-                                  new_base not in list(self.top.base)]
-                old_top_assets = [old_base for old_base in list(self.top.base) if
-                                  old_base not in list(current_top.base)]
-                new_bottom_assets = [new_base for new_base in list(current_bottom.base) if
-                                     new_base not in list(self.bottom.base)]
-                old_bottom_assets = [old_base for old_base in list(self.bottom.base) if
-                                     old_base not in list(current_bottom.base)]
+                # keep the ranking order in the reported lists
+                new_top_assets = [base for base in current_top_bases if base not in previous_top_set]
+                old_top_assets = [base for base in previous_top_bases if base not in current_top_set]
+                new_bottom_assets = [base for base in current_bottom_bases if base not in previous_bottom_set]
+                old_bottom_assets = [base for base in previous_bottom_bases if base not in current_bottom_set]
                 self.top = current_top
                 self.bottom = current_bottom
                 self.raking_updated = True
@@ -566,14 +940,16 @@ class KalmanFilterNewtoninanController(ControllerBase):
     async def update_dbars(self) -> None:
         for trading_pair_interval, candle in self.candles.items():
             # check if dbar_df is ready and if the last update is newer than the last time reported
-            if candle.dbar_ready and candle.last_timestamp < candle.dbars_df["timestamp"].iloc[-1]:
-                candle.last_timestamp = candle.dbars_df["timestamp"].iloc[-1]
+            if not candle.dbar_ready:
+                continue
+            last_timestamp = _last_value(candle.dbars_df, "timestamp")
+            if candle.last_timestamp < last_timestamp:
+                candle.last_timestamp = last_timestamp
                 # get the indicators
-                indicators_df = self.get_indicators(candle, trading_pair_interval, config=self.config,
-                                                    dbar=self.config.dbars)
+                indicators_df = self._get_indicators_cached(candle, trading_pair_interval)
 
                 # replace the values in the all_metrics_df for the trading pair
-                self.all_metrics_df.loc[trading_pair_interval] = indicators_df.iloc[-1]
+                self._store_metrics(trading_pair_interval, indicators_df)
                 self.logger().info(f"Updated metrics for {trading_pair_interval}")
 
                 self.metrics_updated = True  # we set the flag to update the ranking
@@ -584,35 +960,26 @@ class KalmanFilterNewtoninanController(ControllerBase):
         """
         Get the ranking of the trading pairs based on the metrics
         """
-        all_metrics_df = all_metrics_df.sort_values(by=sort_values_by, ascending=False)
+        # partial selection of both sides instead of sorting the whole frame
+        top = all_metrics_df.nlargest(n_side, sort_values_by)
+        bottom = all_metrics_df.nsmallest(n_side, sort_values_by)
 
-        # resorting the selected top and bottom by v fast
-        top = all_metrics_df.head(n_side).sort_values(by='v', ascending=False)
-        bottom = all_metrics_df.tail(n_side).sort_values(by='v', ascending=True)
+        # filter out the ones with v_slow <= 0 from the top and v_slow >= 0 from the bottom
+        top_mask = top['v2'] > 0
+        bottom_mask = bottom['v2'] < 0
 
-        # filter out the ones with v_slow <= 0 from the top
-        top = top[top['v2'] > 0]
-        # filter out the ones with v_slow >= 0 from the bottom
-        bottom = bottom[bottom['v2'] < 0]
+        if self.filter_polarity:
+            # filter out the ones with v <= 0 from the top and v >= 0 from the bottom
+            top_mask &= top['v'] > 0
+            bottom_mask &= bottom['v'] < 0
 
-        if self.config.filter_polarity:
-            # filter out the ones with v <= 0 from the top
-            top = top[top['v'] > 0]
-            # filter out the ones with v >= 0 from the bottom
-            bottom = bottom[bottom['v'] < 0]
+        # resorting the selected top and bottom by v fast
+        top = top[top_mask].sort_values(by='v', ascending=False)
+        bottom = bottom[bottom_mask].sort_values(by='v', ascending=True)
 
-        n_report_top = np.min([n_side, len(top)])
         # create a rank column for the top and bottom
-        # if n_report_top only create the rank column
-        if n_report_top > 0:
-            top['rank'] = range(1, n_report_top + 1)
-        else:
-            top['rank'] = None
-        n_report_bottom = np.min([n_side, len(bottom)])
-        if n_report_bottom > 0:
-            bottom['rank'] = range(1, n_report_bottom + 1)
-        else:
-            bottom['rank'] = None
+        top['rank'] = np.arange(1, len(top) + 1)
+        bottom['rank'] = np.arange(1, len(bottom) + 1)
 
         return top, bottom
 
@@ -635,87 +1002,59 @@ class KalmanFilterNewtoninanController(ControllerBase):
             )
         pass
 
-    def create_market_analysis(self):
-        market_metrics = {}
+    async def create_market_analysis(self):
+        last_rows = {}
         market_satus_metrics = {}
-        comparison_candle = self.candles['BTC']
-        self.df_comparison = self.get_indicators(comparison_candle, 'BTC',
-                                                 config=self.config, dbar=self.dbars)
+
+        # the assets are independent, compute their indicators in parallel off the event loop
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=min(len(self.candles), os.cpu_count() or 1)) as pool:
+            indicators = await asyncio.gather(*[
+                loop.run_in_executor(pool, self._get_indicators_cached, candle, trading_pair_interval)
+                for trading_pair_interval, candle in self.candles.items()])
+        indicators = dict(zip(self.candles.keys(), indicators))
+
+        self.df_comparison = indicators['BTC']
 
         # we save the metrics for the usd pairs to report
-        market_satus_metrics['BTC'] = self.df_comparison.iloc[-1]
+        market_satus_metrics['BTC'] = self.df_comparison.iloc[[-1]]
 
 
         for trading_pair_interval, candle in self.candles.items():
-            df = self.get_indicators(candle, trading_pair_interval, config=self.config, dbar=self.dbars)
+            df = indicators[trading_pair_interval]
 
             # we need to initialize the last timestamp
-            candle.last_timestamp = df.iloc[-1]["timestamp"]
+            candle.last_timestamp = _last_value(df, "timestamp")
 
-            market_metrics[trading_pair_interval] = df.iloc[-1]
+            # keep the last row as a one-row frame so its column dtypes survive the concat
+            last_rows[trading_pair_interval] = df.iloc[[-1]]
             # if the pair is ETH-USDT we save the metrics to report
             if 'ETH' in trading_pair_interval:
-                market_satus_metrics['ETH'] = df.iloc[-1]
-        all_metrics_df = pd.DataFrame(market_metrics).T
+                market_satus_metrics['ETH'] = last_rows[trading_pair_interval]
 
-        market_satus_metrics = pd.DataFrame(market_satus_metrics).T
+        # one concat for all assets; building from a dict of row Series and transposing
+        # left every column as object dtype
+        all_metrics_df = pd.concat(last_rows.values())
+        all_metrics_df.index = list(last_rows.keys())
+
+        market_status_keys = list(market_satus_metrics.keys())
+        market_satus_metrics = pd.concat(market_satus_metrics.values())
+        market_satus_metrics.index = market_status_keys
         self.logger().info("Market analysis inizialized!")
         self.market_analysis_initialized = True
         return all_metrics_df, market_satus_metrics
 
-    @staticmethod
-    def get_indicators(candle, trading_pair_interval, config, dbar: bool = False):
-        if dbar:
-            df = candle.dbars_df.copy()
-            df["interval"] = config.virtual_interval
-        else:
-            df = candle.candles_df.copy()
-            df["interval"] = config.candles_interval
-        df["base"] = trading_pair_interval
-
-        # adding volatility metrics
-        df["volatility"] = df["close"].pct_change().rolling(config.volatility_interval).std()
-        df["volatility_pct"] = df["volatility"] / df["close"]
-        df["volatility_pct_mean"] = df["volatility_pct"].rolling(config.volatility_interval).mean()
-
-        # adding bbands metrics
-        df.ta.bbands(length=config.volatility_interval, append=True)
-        df["bbands_width_pct"] = df[f"BBB_{config.volatility_interval}_2.0"]
-        df["bbands_width_pct_mean"] = df["bbands_width_pct"].rolling(config.volatility_interval).mean()
-        df["bbands_percentage"] = df[f"BBP_{config.volatility_interval}_2.0"]
-        df["natr"] = ta.natr(df["high"], df["low"], df["close"], length=config.volatility_interval)
-
-        # adding Kalman filter
-        if dbar:
-            df = KF.kalman3_dollar(df, key='close', gain=config.kf_fast_gain, gain2=config.kf_slow_gain,
-                                   gain3=config.kf_slower_gain)
-        else:
-            interval_in_s = candle.interval_to_seconds[df['interval']]
-            df = KF.kalman3_tbars(df, interval_in_s, key='close', gain=config.kf_fast_gain, gain2=config.kf_slow_gain,
-                                  gain3=config.kf_slower_gain)
-        df['price_zscore'] = (df['close'] - df['x']) / df['close'].rolling(config.trend_interval).std()
-        df['price_zscore2'] = (df['close'] - df['x2']) / df['close'].rolling(config.trend_interval).std()
-
-        df['kf_delta'] = df['x'] - df['x2']
-
-        df['a_zscore'] = (df['a'] - df['a'].rolling(config.trend_interval).mean()) / df['a'].rolling(
-            config.trend_interval).std()
-        df['v_zscore'] = (df['v'] - df['v'].rolling(config.trend_interval).mean()) / df['v'].rolling(
-            config.trend_interval).std()
-        # compute this for the second kalman filter
-        df['a_zscore2'] = (df['a2'] - df['a2'].rolling(config.trend_interval).mean()) / df['a2'].rolling(
-            config.trend_interval).std()
-        df['v_zscore2'] = (df['v2'] - df['v2'].rolling(config.trend_interval).mean()) / df['v2'].rolling(
-            config.trend_interval).std()
-
-        # polarity of the trend True if both v and v2 are positive or negative
-        df['trend_polarity'] = (df['v'] * df['v2']) > 0
-
-        # adding pct change of the price
-        df['price_%ret'] = df['close'].pct_change(config.pct_change_interval)
-        df['percentile_%ret'] = [len(df[df['price_%ret'] <= df['price_%ret'].iloc[i]]) / (len(df) - 1) for i in
-                                 range(len(df))]
-
+    def _get_indicators_cached(self, candle, base: str) -> pd.DataFrame:
+        """
+        get_indicators memoized on the asset's last bar timestamp
+        """
+        bars_df = candle.dbars_df if self.dbars else candle.candles_df
+        last_ts = _last_value(bars_df, "timestamp")
+        cached = self._indicator_cache.get(base)
+        if cached is not None and cached[0] == last_ts:
+            return cached[1]
+        df = get_indicators(candle, base, self._indicator_params, dbar=self.dbars)
+        self._indicator_cache[base] = (last_ts, df)
         return df
 
     def determine_executor_actions(self) -> List[ExecutorAction]:
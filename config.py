@@ -11,6 +11,97 @@ class TestModeOptions:
     STANDARD = 0
 
 
+def _parse_bool(value: str) -> bool:
+    return value.lower() == 'true'
+
+
+def _parse_csv(value: str) -> list:
+    return value.split(',')
+
+
+# (attribute, environment variable, parser, default); a None default is kept as None without parsing
+_SCHEMA = (
+    # blacklisted tokens
+    ('blacklisted_tokens', 'BLACKLISTED_TOKENS', _parse_csv, 'USDT,USD,USDC,DAI,BUSD,UST,EURC,EUR,GBP,JPY,AUD,CAD,CHF'),
+
+    # Margin management settings
+    ('margin_tiers_csv_path', 'MARGIN_TIERS_CSV_PATH', str, 'hyperliquid_margin_tiers.csv'),
+    ('margin_network', 'MARGIN_NETWORK', str, 'mainnet'),
+    ('minimum_leverage', 'MINIMUM_LEVERAGE', float, '5.0'),
+    ('use_optimal_leverage', 'USE_OPTIMAL_LEVERAGE', _parse_bool, 'true'),
+    ('leverage_risk_factor', 'LEVERAGE_RISK_FACTOR', float, '0.8'),
+    ('max_leverage', 'MAX_LEVERAGE', float, '50.0'),
+
+    # MQTT Configuration
+    ('mqtt_broker_host', 'MQTT_BROKER_HOST', str, 'localhost'),
+    ('mqtt_broker_port', 'MQTT_BROKER_PORT', int, '1883'),
+    ('mqtt_username', 'MQTT_USERNAME', str, None),
+    ('mqtt_password', 'MQTT_PASSWORD', str, None),
+    ('mqtt_topic', 'MQTT_TOPIC', str, 'ranking'),
+    ('mqtt_qos', 'MQTT_QOS', int, '1'),
+    ('mqtt_control_topic', 'MQTT_CONTROL_TOPIC', str, 'hummmingbot/LS/notifications'),
+
+    # Telegram Configuration
+    ('telegram_token', 'TELEGRAM_BOT_TOKEN', str, None),
+    ('telegram_chat_id', 'TELEGRAM_CHAT_ID', str, None),
+    ('verbose_telegram', 'VERBOSE_TELEGRAM', _parse_bool, 'false'),
+
+    # Hummingbot API Configuration
+    ('hb_api_url', 'HUMMINGBOT_API_URL', str, 'http://localhost:8000'),
+    ('hb_api_password', 'HUMMINGBOT_API_PASSWORD', str, 'admin'),
+    ('hb_api_keepalive_interval', 'HUMMINGBOT_API_KEEPALIVE_INTERVAL', int, '10'),
+
+    # Exchange Configuration
+    ('candles_exchange', 'CANDLES_EXCHANGE', str, 'binance_perpetual'),
+    ('trading_exchange', 'TRADING_EXCHANGE', str, 'hyperliquid_perpetual'),
+    ('candles_quote', 'CANDLES_QUOTE', str, 'USDT'),
+    ('trading_quote', 'TRADING_QUOTE', str, 'USD'),
+    ('base_extra_key_trading', 'BASE_EXTRA_KEY_TRADING', str, 'k'),
+    ('base_extra_key_candles', 'BASE_EXTRA_KEY_CANDLES', str, '1000'),
+
+    # Bot Images
+    ('signal_monitor_hb_image', 'SIGNAL_MONITOR_HB_IMAGE', str, '3mc/hummingbot:latest'),
+    ('trading_hb_image', 'TRADING_HB_IMAGE', str, 'hummingbot/hummingbot:latest'),
+
+    # Instance Names
+    ('monitoring_instance_name', 'MONITORING_INSTANCE_NAME', str, 'LS_signal_monitoring'),
+    ('credentials_profile', 'CREDENTIALS_PROFILE', str, '3MC_testbed'),
+
+    # Trading Configuration
+    ('total_trading_amount', 'TOTAL_TRADING_AMOUNT', float, '1000'),
+    ('top_assets_count', 'TOP_ASSETS_COUNT', int, '5'),
+    ('bottom_assets_count', 'BOTTOM_ASSETS_COUNT', int, '5'),
+    ('monitor_top_count', 'MONITOR_TOP_COUNT', int, '8'),
+    ('monitor_bottom_count', 'MONITOR_BOTTOM_COUNT', int, '8'),
+    ('smart_close', 'SMART_CLOSE', str, 'close'),
+
+    # TWAP Configuration
+    ('min_notional_size', 'MIN_NOTIONAL_SIZE', float, '12'),
+    ('batch_size_quote', 'BATCH_SIZE_QUOTE', float, '15'),
+    ('batch_interval', 'BATCH_INTERVAL', int, '15'),
+    #('leverage', 'LEVERAGE', int, '20'),
+    ('hold_duration_seconds', 'HOLD_DURATION_SECONDS', int, '600'),
+    ('test_mode_trading', 'TEST_MODE_TRADING', _parse_bool, 'true'),
+
+    # Signal Monitor Configuration
+    ('kf_slow_gain', 'KF_SLOW_GAIN', float, '0.1044'),
+    ('kf_fast_gain', 'KF_FAST_GAIN', float, '0.441'),
+    ('kf_slower_gain', 'KF_SLOWER_GAIN', float, '0.01'),
+    ('dbars_lookback', 'DBARS_LOOKBACK', str, '14d'),
+    ('candles_interval', 'CANDLES_INTERVAL', str, '5m'),
+    ('virtual_interval', 'VIRTUAL_INTERVAL', str, '30m'),
+    ('filter_polarity', 'FILTER_POLARITY', _parse_bool, 'true'),
+
+    # CMC API for Top 100
+    ('cmc_api_key', 'CMC_API_KEY', str, ''),
+
+    # Bot Behavior Configuration
+    ('update_interval', 'UPDATE_INTERVAL', int, '1'),
+    ('enable_detailed_messages', 'ENABLE_DETAILED_MESSAGES', _parse_bool, 'true'),
+    ('test_mode', 'TEST_MODE', int, TestModeOptions.STANDARD),
+)
+
+
 class Config:
     """Configuration manager for the bot"""
     
@@ -18,84 +109,11 @@ class Config:
         # Load environment variables
         load_dotenv()
 
-        # blacklisted tokens
-        self.blacklisted_tokens = os.getenv('BLACKLISTED_TOKENS', 'USDT,USD,USDC,DAI,BUSD,UST,EURC,EUR,GBP,JPY,AUD,CAD,CHF').split(',')
-
-
-        # Margin management settings
-        self.margin_tiers_csv_path = os.getenv('MARGIN_TIERS_CSV_PATH', 'hyperliquid_margin_tiers.csv')
-        self.margin_network = os.getenv('MARGIN_NETWORK', 'mainnet')
-        self.minimum_leverage = float(os.getenv('MINIMUM_LEVERAGE', '5.0'))
-        self.use_optimal_leverage = os.getenv('USE_OPTIMAL_LEVERAGE', 'true').lower() == 'true'
-        self.leverage_risk_factor = float(os.getenv('LEVERAGE_RISK_FACTOR', '0.8'))
-        self.max_leverage = float(os.getenv('MAX_LEVERAGE', '50.0'))
-        
-        # MQTT Configuration
-        self.mqtt_broker_host = os.getenv('MQTT_BROKER_HOST', 'localhost')
-        self.mqtt_broker_port = int(os.getenv('MQTT_BROKER_PORT', '1883'))
-        self.mqtt_username = os.getenv('MQTT_USERNAME')
-        self.mqtt_password = os.getenv('MQTT_PASSWORD')
-        self.mqtt_topic = os.getenv('MQTT_TOPIC', 'ranking')
-        self.mqtt_qos = int(os.getenv('MQTT_QOS', '1'))
-        self.mqtt_control_topic = os.getenv('MQTT_CONTROL_TOPIC', 'hummmingbot/LS/notifications')
-        
-        # Telegram Configuration
-        self.telegram_token = os.getenv('TELEGRAM_BOT_TOKEN')
-        self.telegram_chat_id = os.getenv('TELEGRAM_CHAT_ID')
-        self.verbose_telegram = os.getenv('VERBOSE_TELEGRAM', 'false').lower() == 'true'
-        
-        # Hummingbot API Configuration
-        self.hb_api_url = os.getenv('HUMMINGBOT_API_URL', 'http://localhost:8000')
-        self.hb_api_password = os.getenv('HUMMINGBOT_API_PASSWORD', 'admin')
-        
-        # Exchange Configuration
-        self.candles_exchange = os.getenv('CANDLES_EXCHANGE', 'binance_perpetual')
-        self.trading_exchange = os.getenv('TRADING_EXCHANGE', 'hyperliquid_perpetual')
-        self.candles_quote = os.getenv('CANDLES_QUOTE', 'USDT')
-        self.trading_quote = os.getenv('TRADING_QUOTE', 'USD')
-        self.base_extra_key_trading = os.getenv('BASE_EXTRA_KEY_TRADING', 'k')
-        self.base_extra_key_candles = os.getenv('BASE_EXTRA_KEY_CANDLES', '1000')
-        
-        # Bot Images
-        self.signal_monitor_hb_image = os.getenv('SIGNAL_MONITOR_HB_IMAGE', '3mc/hummingbot:latest')
-        self.trading_hb_image = os.getenv('TRADING_HB_IMAGE', 'hummingbot/hummingbot:latest')
-        
-        # Instance Names
-        self.monitoring_instance_name = os.getenv('MONITORING_INSTANCE_NAME', 'LS_signal_monitoring')
-        self.credentials_profile = os.getenv('CREDENTIALS_PROFILE', '3MC_testbed')
-        
-        # Trading Configuration
-        self.total_trading_amount = float(os.getenv('TOTAL_TRADING_AMOUNT', '1000'))
-        self.top_assets_count = int(os.getenv('TOP_ASSETS_COUNT', '5'))
-        self.bottom_assets_count = int(os.getenv('BOTTOM_ASSETS_COUNT', '5'))
-        self.monitor_top_count = int(os.getenv('MONITOR_TOP_COUNT', '8'))
-        self.monitor_bottom_count = int(os.getenv('MONITOR_BOTTOM_COUNT', '8'))
-        self.smart_close = os.getenv('SMART_CLOSE', 'close')
-        
-        # TWAP Configuration
-        self.min_notional_size = float(os.getenv('MIN_NOTIONAL_SIZE', '12'))
-        self.batch_size_quote = float(os.getenv('BATCH_SIZE_QUOTE', '15'))
-        self.batch_interval = int(os.getenv('BATCH_INTERVAL', '15'))
-        #self.leverage = int(os.getenv('LEVERAGE', '20'))
-        self.hold_duration_seconds = int(os.getenv('HOLD_DURATION_SECONDS', '600'))
-        self.test_mode_trading = os.getenv('TEST_MODE_TRADING', 'true').lower() == 'true'
-        
-        # Signal Monitor Configuration
-        self.kf_slow_gain = float(os.getenv('KF_SLOW_GAIN', '0.1044'))
-        self.kf_fast_gain = float(os.getenv('KF_FAST_GAIN', '0.441'))
-        self.kf_slower_gain = float(os.getenv('KF_SLOWER_GAIN', '0.01'))
-        self.dbars_lookback = os.getenv('DBARS_LOOKBACK', '14d')
-        self.candles_interval = os.getenv('CANDLES_INTERVAL', '5m')
-        self.virtual_interval = os.getenv('VIRTUAL_INTERVAL', '30m')
-        self.filter_polarity = os.getenv('FILTER_POLARITY', 'true').lower() == 'true'
-        
-        # CMC API for Top 100
-        self.cmc_api_key = os.getenv('CMC_API_KEY', '')
-        
-        # Bot Behavior Configuration
-        self.update_interval = int(os.getenv('UPDATE_INTERVAL', '1'))
-        self.enable_detailed_messages = os.getenv('ENABLE_DETAILED_MESSAGES', 'true').lower() == 'true'
-        self.test_mode = int(os.getenv('TEST_MODE', TestModeOptions.STANDARD))
+        # One pass over the schema, parsing each value with its declared type
+        env = os.environ
+        for attribute, name, parse, default in _SCHEMA:
+            value = env.get(name, default)
+            setattr(self, attribute, None if value is None else parse(value))
         
         # Validate required configuration
         self._validate_config()
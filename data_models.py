@@ -16,7 +16,7 @@ class BotState(Enum):
     ARCHIVED = "archived"
 
 
-@dataclass
+@dataclass(slots=True)
 class AssetRanking:
     """Data class for asset ranking information"""
     trading_pair: str
@@ -32,7 +32,7 @@ class AssetRanking:
     price_zscore2: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class RankingMessage:
     """Data class for the complete ranking message"""
     timestamp: float
@@ -48,7 +48,7 @@ class RankingMessage:
     old_bottom: Set[str] = field(default_factory=set)
 
 
-@dataclass
+@dataclass(slots=True)
 class TradingBot:
     """Data class for tracking trading bot instances"""
     instance_name: str
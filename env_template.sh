@@ -46,6 +46,10 @@ HUMMINGBOT_API_URL=http://localhost:8000
 # Hummingbot API password
 HUMMINGBOT_API_PASSWORD=admin
 
+# Seconds between keepalive pings to the Hummingbot API (0 = disabled)
+# Keeps the pooled connection open so bot launches don't pay a new handshake
+HUMMINGBOT_API_KEEPALIVE_INTERVAL=10
+
 # =============================================================================
 # Exchange Configuration
 # =============================================================================
@@ -1,8 +1,33 @@
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass
 from typing import Optional, Dict, List, Tuple
 
 
+# Numeric column types of the margin tier CSV
+TIER_DTYPES = {
+    'tier': 'int32',
+    'min_notional': 'float64',
+    'max_notional': 'float64',
+    'max_leverage': 'int16',
+}
+
+
+@dataclass(slots=True, frozen=True)
+class MarginResult:
+    """Maintenance margin calculation for a position"""
+    asset: str
+    notional_value: float
+    max_leverage: int
+    maintenance_margin_rate: float
+    maintenance_margin: float
+    network: str
+
+    @property
+    def maintenance_margin_rate_percent(self) -> float:
+        return self.maintenance_margin_rate * 100
+
+
 class HyperliquidMarginManager:
     """
     A class to manage Hyperliquid margin tiers and calculate appropriate leverage
@@ -18,18 +43,60 @@ class HyperliquidMarginManager:
         """
         self.csv_file_path = csv_file_path
         self.margin_tiers = None
+        # (asset, network) -> (min_notional, max_notional, max_leverage) arrays in tier order
+        self._tier_index: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        # network -> sorted asset symbols
+        self._supported_by_network: Dict[str, List[str]] = {}
+        # (normalized asset, network) -> tiers frame, filled on first request
+        self._asset_tiers_cache: Dict[Tuple[str, str], Optional[pd.DataFrame]] = {}
         self.load_margin_tiers()
     
     def load_margin_tiers(self) -> None:
         """Load margin tier data from CSV file."""
         try:
-            self.margin_tiers = pd.read_csv(self.csv_file_path)
+            try:
+                self.margin_tiers = pd.read_csv(self.csv_file_path, dtype=TIER_DTYPES, engine='pyarrow')
+            except ImportError:
+                # pyarrow not installed, use the default parser
+                self.margin_tiers = pd.read_csv(self.csv_file_path, dtype=TIER_DTYPES)
+            # Normalize the lookup columns once, lookups only normalize their arguments.
+            # As categoricals the tier filters compare integer codes instead of strings.
+            self.margin_tiers['asset'] = self.margin_tiers['asset'].str.upper().astype('category')
+            self.margin_tiers['normalized_asset'] = self.margin_tiers['normalized_asset'].str.upper().astype('category')
+            self.margin_tiers['network'] = self.margin_tiers['network'].str.lower().astype('category')
+            self._tier_index = self._build_tier_index(self.margin_tiers)
+            self._supported_by_network = {
+                network: sorted(assets.unique().tolist())
+                for network, assets in self.margin_tiers.groupby('network', observed=True)['asset']
+            }
+            self._asset_tiers_cache = {}
             print(f"Loaded margin tiers for {len(self.margin_tiers['asset'].unique())} unique assets")
         except FileNotFoundError:
             raise FileNotFoundError(f"Margin tiers CSV file not found: {self.csv_file_path}")
         except Exception as e:
             raise Exception(f"Error loading margin tiers: {str(e)}")
     
+    @staticmethod
+    def _build_tier_index(margin_tiers: pd.DataFrame) -> Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Build the per asset and network tier arrays used by get_max_leverage.
+        
+        Args:
+            margin_tiers (pd.DataFrame): Margin tier data as loaded from the CSV
+        
+        Returns:
+            Dict: (asset, network) -> (min_notional, max_notional, max_leverage) arrays sorted by tier
+        """
+        tier_index = {}
+        grouped = margin_tiers.sort_values('tier').groupby(['asset', 'network'], sort=False, observed=True)
+        for (asset, network), tiers in grouped:
+            tier_index[(asset, network)] = (
+                tiers['min_notional'].to_numpy(dtype=float),
+                tiers['max_notional'].to_numpy(dtype=float),
+                tiers['max_leverage'].to_numpy(),
+            )
+        return tier_index
+    
     def get_max_leverage(self, asset: str, notional_value: float, network: str = 'mainnet') -> Optional[int]:
         """
         Get the maximum leverage for a given asset and notional position value.
@@ -42,25 +109,54 @@ class HyperliquidMarginManager:
         Returns:
             Optional[int]: Maximum leverage allowed, or None if asset not found
         """
-        # Filter data for the specific asset and network
-        asset_data = self.margin_tiers[
-            (self.margin_tiers['asset'] == asset.upper()) & 
-            (self.margin_tiers['network'] == network.lower())
-        ].copy()
-        
-        if asset_data.empty:
+        tiers = self._tier_index.get((asset.upper(), network.lower()))
+        if tiers is None:
             return None
+        min_notional, max_notional, max_leverage = tiers
         
-        # Sort by tier to ensure proper order
-        asset_data = asset_data.sort_values('tier')
-        
-        # Find the appropriate tier based on notional value
-        for _, row in asset_data.iterrows():
-            if row['min_notional'] <= notional_value <= row['max_notional']:
-                return int(row['max_leverage'])
+        # First tier (in tier order) whose upper bound covers the notional value. searchsorted
+        # puts an empty (NaN) upper bound last, which must not match like the old range check
+        i = np.searchsorted(max_notional, notional_value, side='left')
+        if i < len(max_notional) and min_notional[i] <= notional_value and not np.isnan(max_notional[i]):
+            return int(max_leverage[i])
         
         return None
     
+    def get_max_leverage_batch(self, assets, notional_values, network: str = 'mainnet') -> np.ndarray:
+        """
+        Get the maximum leverage for many positions at once.
+        
+        Args:
+            assets: Asset symbols, one per position
+            notional_values: Notional position values in USD, one per position
+            network (str): Network type ('mainnet' or 'testnet')
+        
+        Returns:
+            np.ndarray: Maximum leverage per position, NaN where the asset or notional has no tier
+        """
+        assets = np.asarray(assets)
+        notional_values = np.asarray(notional_values, dtype=float)
+        leverages = np.full(len(notional_values), np.nan)
+        network = network.lower()
+        
+        # One searchsorted per distinct asset over all of its positions
+        unique_assets, inverse = np.unique(assets, return_inverse=True)
+        for k, asset in enumerate(unique_assets):
+            tiers = self._tier_index.get((str(asset).upper(), network))
+            if tiers is None:
+                continue
+            min_notional, max_notional, max_leverage = tiers
+            positions = np.flatnonzero(inverse == k)
+            values = notional_values[positions]
+            
+            tier = np.searchsorted(max_notional, values, side='left')
+            in_range = tier < len(max_notional)
+            tier = np.minimum(tier, len(max_notional) - 1)
+            covered = in_range & (min_notional[tier] <= values) & ~np.isnan(max_notional[tier])
+            leverages[positions[covered]] = max_leverage[tier[covered]]
+        
+        return leverages
+    
     def get_maintenance_margin_rate(self, max_leverage: int) -> float:
         """
         Calculate maintenance margin rate based on maximum leverage.
@@ -81,7 +177,7 @@ class HyperliquidMarginManager:
         return maintenance_margin_rate
     
     def calculate_maintenance_margin(self, asset: str, notional_value: float, 
-                                   network: str = 'mainnet') -> Optional[Dict]:
+                                   network: str = 'mainnet') -> Optional[MarginResult]:
         """
         Calculate maintenance margin for a position.
         
@@ -91,7 +187,7 @@ class HyperliquidMarginManager:
             network (str): Network type
         
         Returns:
-            Optional[Dict]: Dictionary with margin calculation details or None if asset not found
+            Optional[MarginResult]: Margin calculation details or None if asset not found
         """
         max_leverage = self.get_max_leverage(asset, notional_value, network)
         if max_leverage is None:
@@ -104,15 +200,14 @@ class HyperliquidMarginManager:
         # Note: Full maintenance_deduction calculation would require iterating through all tiers
         maintenance_margin = notional_value * maintenance_margin_rate
         
-        return {
-            'asset': asset,
-            'notional_value': notional_value,
-            'max_leverage': max_leverage,
-            'maintenance_margin_rate': maintenance_margin_rate,
-            'maintenance_margin_rate_percent': maintenance_margin_rate * 100,
-            'maintenance_margin': maintenance_margin,
-            'network': network
-        }
+        return MarginResult(
+            asset=asset,
+            notional_value=notional_value,
+            max_leverage=max_leverage,
+            maintenance_margin_rate=maintenance_margin_rate,
+            maintenance_margin=maintenance_margin,
+            network=network
+        )
     
     def get_optimal_leverage(self, asset: str, notional_value: float, 
                            risk_factor: float = 0.8, network: str = 'mainnet') -> Optional[float]:
@@ -134,6 +229,22 @@ class HyperliquidMarginManager:
         
         return max_leverage * risk_factor
     
+    def get_optimal_leverage_batch(self, assets, notional_values, risk_factor: float = 0.8,
+                                   network: str = 'mainnet') -> np.ndarray:
+        """
+        Get optimal leverage for many positions at once.
+        
+        Args:
+            assets: Asset symbols, one per position
+            notional_values: Notional position values in USD, one per position
+            risk_factor (float): Risk reduction factor (0.8 = use 80% of max leverage)
+            network (str): Network type
+        
+        Returns:
+            np.ndarray: Optimal leverage per position, NaN where the asset or notional has no tier
+        """
+        return self.get_max_leverage_batch(assets, notional_values, network) * risk_factor
+    
     def get_supported_assets(self, network: str = 'mainnet') -> List[str]:
         """
         Get list of supported assets for a given network.
@@ -147,11 +258,7 @@ class HyperliquidMarginManager:
         if self.margin_tiers is None:
             return []
         
-        assets = self.margin_tiers[
-            self.margin_tiers['network'] == network.lower()
-        ]['asset'].unique().tolist()
-        
-        return sorted(assets)
+        return list(self._supported_by_network.get(network.lower(), []))
     
     def get_asset_tiers(self, asset: str, network: str = 'mainnet') -> Optional[pd.DataFrame]:
         """
@@ -162,20 +269,23 @@ class HyperliquidMarginManager:
             network (str): Network type
         
         Returns:
-            Optional[pd.DataFrame]: DataFrame with all tiers for the asset
+            Optional[pd.DataFrame]: DataFrame with all tiers for the asset (shared between calls, do not modify)
         """
         if self.margin_tiers is None:
             return None
         
-        asset_tiers = self.margin_tiers[
-            (self.margin_tiers['normalized_asset'] == asset.upper()) & 
-            (self.margin_tiers['network'] == network.lower())
-        ].copy()
+        key = (asset.upper(), network.lower())
+        if key in self._asset_tiers_cache:
+            return self._asset_tiers_cache[key]
         
-        if asset_tiers.empty:
-            return None
+        asset_tiers = self.margin_tiers[
+            (self.margin_tiers['normalized_asset'] == key[0]) & 
+            (self.margin_tiers['network'] == key[1])
+        ]
         
-        return asset_tiers.sort_values('tier')
+        asset_tiers = None if asset_tiers.empty else asset_tiers.sort_values('tier')
+        self._asset_tiers_cache[key] = asset_tiers
+        return asset_tiers
     
     def validate_position(self, asset: str, position_size_usd: float, 
                          desired_leverage: float, network: str = 'mainnet') -> Dict:
@@ -239,11 +349,11 @@ def example_usage():
     print("\n=== Maintenance Margin Calculation ===")
     margin_info = manager.calculate_maintenance_margin('ETH', 50000000)
     if margin_info:
-        print(f"Asset: {margin_info['asset']}")
-        print(f"Position Size: ${margin_info['notional_value']:,}")
-        print(f"Max Leverage: {margin_info['max_leverage']}x")
-        print(f"Maintenance Margin Rate: {margin_info['maintenance_margin_rate_percent']:.2f}%")
-        print(f"Maintenance Margin: ${margin_info['maintenance_margin']:,.2f}")
+        print(f"Asset: {margin_info.asset}")
+        print(f"Position Size: ${margin_info.notional_value:,}")
+        print(f"Max Leverage: {margin_info.max_leverage}x")
+        print(f"Maintenance Margin Rate: {margin_info.maintenance_margin_rate_percent:.2f}%")
+        print(f"Maintenance Margin: ${margin_info.maintenance_margin:,.2f}")
     
     # Example 3: Validate positions
     print("\n=== Position Validation ===")
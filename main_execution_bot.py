@@ -24,6 +24,13 @@ from data_models import BotState
 from telegram_notifier import TelegramNotifier
 from trading_orchestrator import TradingOrchestrator
 from mqtt_parser import MQTTMessageParser
+from async_utils import EVENT_LOOP_IMPL, register_loop, schedule_from_external_thread
+
+# orjson parses the ranking payloads several times faster, fall back to the stdlib parser
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 
 # Configure logging
@@ -72,6 +79,7 @@ class MQTTRankingsExecutionBot:
         self.running = False
         self.shutdown_in_progress = False
         self.test_unwind_mode = False  # Flag for test unwinding
+        self._keepalive_task = None
 
     async def initialize(self):
         """Initialize all components with retry logic"""
@@ -156,25 +164,17 @@ class MQTTRankingsExecutionBot:
                 self.logger.debug("Ignoring MQTT message during shutdown")
                 return
                 
-            # Decode message payload
-            payload = msg.payload.decode('utf-8')
             self.logger.debug(f"Received MQTT message on topic '{msg.topic}'")
 
-            # Parse JSON data
-            data = json.loads(payload)
+            # Parse JSON data straight from the utf-8 payload bytes
+            data = json_loads(msg.payload)
 
             # Schedule async processing in the event loop
             if self.event_loop and not self.event_loop.is_closed():
                 if self.config.test_mode == TestModeOptions.DEV:
-                    asyncio.run_coroutine_threadsafe(
-                        self._send_dev_mode_message(data),
-                        self.event_loop
-                    )
+                    schedule_from_external_thread(self._send_dev_mode_message(data))
                 else:
-                    asyncio.run_coroutine_threadsafe(
-                        self._process_ranking_data(data),
-                        self.event_loop
-                    )
+                    schedule_from_external_thread(self._process_ranking_data(data))
             else:
                 self.logger.error("Event loop not available for processing MQTT message")
 
@@ -242,10 +242,12 @@ class MQTTRankingsExecutionBot:
     async def start(self):
         """Start the MQTT to Telegram bot"""
         self.logger.info("Starting MQTT to Telegram Rankings Execution Bot")
+        self.logger.info(f"Event loop implementation: {EVENT_LOOP_IMPL}")
         
         try:
             # Store the current event loop
             self.event_loop = asyncio.get_running_loop()
+            register_loop(self.event_loop)
             
             # Initialize components
             await self.initialize()
@@ -263,6 +265,9 @@ class MQTTRankingsExecutionBot:
             # Start MQTT loop
             self.running = True
             self.mqtt_client.loop_start()
+
+            if self.config.hb_api_keepalive_interval > 0:
+                self._keepalive_task = asyncio.create_task(self._keep_api_connection_alive())
             
             # Periodic status checks
             while self.running:
@@ -273,6 +278,22 @@ class MQTTRankingsExecutionBot:
             self.logger.error(f"Error starting bot: {e}")
             await self.stop()
     
+    async def _keep_api_connection_alive(self):
+        """
+        Ping the Hummingbot API periodically.
+
+        aiohttp closes pooled connections after 15s idle, so without traffic
+        every bot launch would open a new connection. The ping interval
+        should stay below that timeout.
+        """
+        interval = self.config.hb_api_keepalive_interval
+        while self.running:
+            await asyncio.sleep(interval)
+            try:
+                await self.hb_client.docker.is_running()
+            except Exception as e:
+                self.logger.debug(f"Hummingbot API keepalive ping failed: {e}")
+
     async def _check_bot_health(self):
         """Periodic health check of active bots"""
         try:
@@ -439,6 +460,8 @@ class MQTTRankingsExecutionBot:
         self.logger.info(f"Stopping MQTT to Telegram Rankings Execution Bot (graceful={graceful})")
         
         self.running = False
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
         
         # Send shutdown notification
         await self.telegram.send_message(
@@ -512,6 +535,7 @@ async def main():
             logger.info(f"Running in TEST UNWIND mode with {wait_time}s wait time")
             # Initialize the bot
             bot.event_loop = asyncio.get_running_loop()
+            register_loop(bot.event_loop)
             await bot.initialize()
             
             # Connect MQTT to receive rankings
@@ -249,31 +249,33 @@ class TradingOrchestrator:
                 # Test each asset with a small position to get max leverage
                 test_position_size = 1000  # $1000 USD for testing
                 filtered_assets = set()
+                assets = sorted(common_base_assets)
 
-                for asset in common_base_assets:
-                    try:
-                        # Get max leverage for this asset
-                        max_leverage = self.margin_manager.get_max_leverage(asset, test_position_size, network)
-
-                        if max_leverage is None:
-                            # Asset not in margin tiers, assume leverage of 3
-                            effective_leverage = 3
-                            self.logger.info(f"Asset {asset} not in margin tiers, assuming 3x leverage")
-                        else:
-                            effective_leverage = max_leverage
-
-                        # Check if it meets minimum requirement
-                        if effective_leverage >= min_leverage:
-                            filtered_assets.add(asset)
-                            self.logger.debug(f"Asset {asset}: max leverage {effective_leverage}x - INCLUDED")
-                        else:
-                            self.logger.info(
-                                f"Asset {asset}: max leverage {effective_leverage}x < {min_leverage}x - EXCLUDED")
-
-                    except Exception as e:
-                        self.logger.error(f"Error checking leverage for {asset}: {e}")
-                        # In case of error, include the asset to be safe
+                try:
+                    # Get max leverage for all assets in one batch lookup
+                    max_leverages = self.margin_manager.get_max_leverage_batch(
+                        assets, [test_position_size] * len(assets), network)
+                except Exception as e:
+                    self.logger.error(f"Error checking leverage for {assets}: {e}")
+                    # In case of error, include the assets to be safe
+                    filtered_assets.update(assets)
+                    max_leverages = []
+
+                for asset, max_leverage in zip(assets, max_leverages):
+                    if pd.isna(max_leverage):
+                        # Asset not in margin tiers (NaN), assume leverage of 3
+                        effective_leverage = 3
+                        self.logger.info(f"Asset {asset} not in margin tiers, assuming 3x leverage")
+                    else:
+                        effective_leverage = int(max_leverage)
+
+                    # Check if it meets minimum requirement
+                    if effective_leverage >= min_leverage:
                         filtered_assets.add(asset)
+                        self.logger.debug(f"Asset {asset}: max leverage {effective_leverage}x - INCLUDED")
+                    else:
+                        self.logger.info(
+                            f"Asset {asset}: max leverage {effective_leverage}x < {min_leverage}x - EXCLUDED")
 
                 common_base_assets = filtered_assets
                 self.logger.info(f"After leverage filtering: {len(common_base_assets)} assets remain")